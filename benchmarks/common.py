@@ -0,0 +1,84 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from httpx import ASGITransport, AsyncClient
+
+from fast_zero.app import app
+from fast_zero.database import engine
+from fast_zero.models import table_registry
+
+
+def add_common_arguments(parser):
+    parser.add_argument(
+        '--base-url',
+        help='Run against a live server instead of the in-process app',
+    )
+    parser.add_argument(
+        '--reset',
+        action='store_true',
+        help='Drop and recreate all tables before seeding (destructive!)',
+    )
+    parser.add_argument('--output', help='Write the JSON results to a file')
+
+
+def client(base_url: str | None = None):
+    if base_url:
+        return AsyncClient(base_url=base_url, timeout=None)
+
+    return AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://bench', timeout=None
+    )
+
+
+async def prepare_database(reset: bool = False):
+    """Cria as tabelas no DATABASE_URL configurado (use um banco de teste)."""
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(table_registry.metadata.drop_all)
+        await conn.run_sync(table_registry.metadata.create_all)
+
+
+def summarize(samples: list[float]):
+    """Resumo de latências (em segundos) em milissegundos."""
+    if not samples:
+        return {'count': 0}
+
+    ordered = sorted(samples)
+
+    def pct(p):
+        index = min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'p50_ms': pct(50),
+        'p95_ms': pct(95),
+        'p99_ms': pct(99),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+def git_revision():
+    """Commit atual (com sufixo -dirty), para identificar o resultado."""
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: dict, output: str | None = None):
+    text = json.dumps(results, indent=2, sort_keys=True)
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+
+    sys.stdout.write(text + '\n')
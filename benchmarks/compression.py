@@ -0,0 +1,129 @@
+"""
+CPU gasta versus bytes economizados ao comprimir páginas típicas de
+`GET /todos/` e `GET /users/`, por codificação e nível.
+
+    python -m benchmarks.compression --gzip-level 1 6 9 --zstd-level 1 3
+
+Não usa banco: as páginas são geradas com texto determinístico.
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from benchmarks.common import report, summarize
+from fast_zero.compression import compressors
+from fast_zero.models import TodoState
+from fast_zero.responses import TrustedJSONResponse
+from fast_zero.routers.todos import PAGE_SERIALIZER as TODO_PAGE
+from fast_zero.routers.users import PAGE_SERIALIZER as USER_PAGE
+
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod '
+    'tempor incididunt ut labore et dolore magna aliqua comprar mercado '
+    'reunião relatório revisar enviar projeto cliente entrega prazo'
+).split()
+
+
+def todos_page(size: int, description_words: int, rng: random.Random):
+    now = datetime(2025, 1, 1)
+    return TrustedJSONResponse(
+        {
+            'todos': [
+                {
+                    'title': ' '.join(rng.choices(WORDS, k=3)),
+                    'description': ' '.join(
+                        rng.choices(WORDS, k=description_words)
+                    ),
+                    'state': rng.choice(list(TodoState)),
+                    'id': n,
+                    'created_at': now + timedelta(minutes=n),
+                    'updated_at': now + timedelta(minutes=n, seconds=7),
+                }
+                for n in range(1, size + 1)
+            ],
+            'next_cursor': 'aWQ6MTAw',
+        },
+        serializer=TODO_PAGE,
+    ).body
+
+
+def users_page(size: int, rng: random.Random):
+    return TrustedJSONResponse(
+        {
+            'users': [
+                {
+                    'username': f'{rng.choice(WORDS)}{n}',
+                    'email': f'{rng.choice(WORDS)}{n}@example.com',
+                    'id': n,
+                }
+                for n in range(1, size + 1)
+            ],
+            'next_cursor': 'aWQ6MTAw',
+        },
+        serializer=USER_PAGE,
+    ).body
+
+
+def measure(factory, body: bytes, repeat: int):
+    samples = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        compressed = factory().finish(body)
+        samples.append(perf_counter() - start)
+
+    summary = summarize(samples)
+    saved = len(body) - len(compressed)
+
+    return {
+        **summary,
+        'bytes': len(compressed),
+        'ratio': round(len(compressed) / len(body), 4),
+        'saved_bytes': saved,
+        # Bytes economizados por ms de CPU (p50)
+        'saved_per_ms': round(saved / max(summary['p50_ms'], 1e-6)),
+    }
+
+
+def main(args):
+    rng = random.Random(0)
+    pages = {
+        'todos_100_long': todos_page(100, args.description_words, rng),
+        'todos_100_short': todos_page(100, 3, rng),
+        'users_100': users_page(100, rng),
+    }
+
+    codecs = {
+        f'gzip_{level}': compressors(gzip_level=level)['gzip']
+        for level in args.gzip_level
+    }
+    for level in args.zstd_level:
+        codecs[f'zstd_{level}'] = compressors(zstd_level=level)['zstd']
+
+    results = {
+        name: {
+            'bytes': len(body),
+            **{
+                codec: measure(factory, body, args.repeat)
+                for codec, factory in codecs.items()
+            },
+        }
+        for name, body in pages.items()
+    }
+
+    report(results, args.output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--output', help='Write the JSON results to a file')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--description-words', type=int, default=60)
+    parser.add_argument('--gzip-level', type=int, nargs='+', default=[1, 6, 9])
+    parser.add_argument('--zstd-level', type=int, nargs='+', default=[1, 3, 9])
+
+    main(parser.parse_args())
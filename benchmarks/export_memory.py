@@ -0,0 +1,135 @@
+"""
+Memória (RSS) do processo durante `GET /todos/export` de muitas linhas.
+
+    python -m benchmarks.export_memory --todos 1000000
+
+Chama a aplicação ASGI diretamente, descartando cada pedaço do corpo
+assim que chega (o ASGITransport do httpx acumula a resposta inteira).
+"""
+
+import argparse
+import asyncio
+import os
+from http import HTTPStatus
+from time import perf_counter
+
+from sqlalchemy import func, select, text
+
+from benchmarks.common import prepare_database, report
+from fast_zero.app import app
+from fast_zero.database import engine
+from fast_zero.models import Todo, User
+from fast_zero.security import create_access_token
+
+OWNER = 'bench-export@example.com'
+
+SEED_TODOS = text("""
+    INSERT INTO todos (title, description, state, user_id)
+    SELECT 'todo ' || n, repeat('lorem ipsum ', 8), 'todo', :user_id
+    FROM generate_series(1, :total) AS n
+""")
+
+
+def rss_mb():
+    with open('/proc/self/statm', encoding='utf-8') as statm:
+        pages = int(statm.read().split()[1])
+
+    return round(pages * os.sysconf('SC_PAGE_SIZE') / 2**20, 1)
+
+
+async def seed(total: int):
+    async with engine.begin() as conn:
+        user_id = await conn.scalar(select(User.id).where(User.email == OWNER))
+
+        if not user_id:
+            user_id = await conn.scalar(
+                User.__table__
+                .insert()
+                .values(username='bench-export', email=OWNER, password='x')
+                .returning(User.id)
+            )
+
+        existing = await conn.scalar(
+            select(func.count(Todo.id)).where(Todo.user_id == user_id)
+        )
+
+        if existing < total:
+            await conn.execute(
+                SEED_TODOS, {'user_id': user_id, 'total': total - existing}
+            )
+
+
+async def main(args):
+    await prepare_database(reset=args.reset)
+    await seed(args.todos)
+
+    token = create_access_token({'sub': OWNER})
+    samples = []
+    received = 0
+    status = None
+    start = perf_counter()
+
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': '/todos/export',
+        'raw_path': b'/todos/export',
+        'query_string': f'format={args.format}'.encode(),
+        'root_path': '',
+        'headers': [(b'authorization', f'Bearer {token}'.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('bench', 80),
+    }
+
+    requested = asyncio.Event()
+
+    async def receive():
+        if requested.is_set():
+            # O cliente nunca desconecta: bloqueia até o fim da resposta
+            await asyncio.Future()
+
+        requested.set()
+
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal received, status
+
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            received += len(message.get('body', b''))
+            samples.append(rss_mb())
+
+    await app(scope, receive, send)
+
+    if status != HTTPStatus.OK:
+        raise SystemExit(f'export failed with status {status}')
+
+    report(
+        {
+            'todos': args.todos,
+            'format': args.format,
+            'seconds': round(perf_counter() - start, 2),
+            'bytes': received,
+            'rss_first_chunk_mb': samples[0],
+            'rss_peak_mb': max(samples),
+            'rss_last_mb': samples[-1],
+        },
+        args.output,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=1_000_000)
+    parser.add_argument(
+        '--format', choices=['ndjson', 'csv'], default='ndjson'
+    )
+    parser.add_argument('--reset', action='store_true')
+    parser.add_argument('--output')
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,234 @@
+"""
+Carga HTTP nos fluxos principais da API: login, CRUD de todos e listagem
+de usuários. Reporta vazão e p50/p95/p99 por cenário em JSON, para
+comparar entre commits.
+
+    python -m benchmarks.http_load --concurrency 16 --output before.json
+    python -m benchmarks.http_load --base-url http://localhost:8000
+
+Sem --base-url o app roda no próprio processo (ASGI), contra o
+DATABASE_URL configurado. Os dados são semeados pela própria API.
+"""
+
+import argparse
+import asyncio
+import secrets
+from itertools import count
+from time import perf_counter
+
+from benchmarks.common import (
+    add_common_arguments,
+    client,
+    git_revision,
+    prepare_database,
+    report,
+    summarize,
+)
+from fast_zero.security import hashing_executor, login_throttle
+
+PASSWORD = 'bench-secret'
+
+
+async def run_scenario(requests: int, concurrency: int, send):
+    """
+    Executa `requests` chamadas de `send(i)` com `concurrency` workers.
+
+    `send` devolve a resposta httpx; latência e status são registrados.
+    """
+    samples: list[float] = []
+    statuses: dict[int, int] = {}
+    counter = count()
+
+    async def worker():
+        while (i := next(counter)) < requests:
+            start = perf_counter()
+            response = await send(i)
+            samples.append(perf_counter() - start)
+            statuses[response.status_code] = (
+                statuses.get(response.status_code, 0) + 1
+            )
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+
+    return {
+        **summarize(samples),
+        'requests_per_second': round(requests / elapsed, 2),
+        'statuses': {str(status): n for status, n in sorted(statuses.items())},
+    }
+
+
+async def seed(http, args):
+    """Cria usuários e todos pela API; devolve (usuários, ids por usuário)."""
+    run = secrets.token_hex(4)
+    users = []
+
+    for n in range(args.users):
+        user = {
+            'username': f'bench-{run}-{n}',
+            'email': f'bench-{run}-{n}@example.com',
+            'password': PASSWORD,
+        }
+        response = await http.post('/users/', json=user)
+        response.raise_for_status()
+
+        response = await http.post(
+            '/auth/token/',
+            data={'username': user['email'], 'password': PASSWORD},
+        )
+        response.raise_for_status()
+        user['headers'] = {
+            'Authorization': f'Bearer {response.json()["access_token"]}'
+        }
+        users.append(user)
+
+    todos = {}
+    for user in users:
+        ids = []
+        for start in range(0, args.todos_per_user, args.bulk_size):
+            batch = [
+                {
+                    'title': f'todo {n}',
+                    'description': f'benchmark todo number {n}',
+                    'state': 'todo',
+                }
+                for n in range(
+                    start, min(start + args.bulk_size, args.todos_per_user)
+                )
+            ]
+            response = await http.post(
+                '/todos/bulk', json=batch, headers=user['headers']
+            )
+            response.raise_for_status()
+            ids += [todo['id'] for todo in response.json()['todos']]
+        todos[user['email']] = ids
+
+    return users, todos
+
+
+async def main(args):
+    if not args.base_url:
+        await prepare_database(reset=args.reset)
+        # O cenário de login mede o argon2, não o limitador; contra um
+        # servidor remoto use LOGIN_THROTTLE_ENABLED=false
+        login_throttle.enabled = False
+
+    try:
+        async with client(args.base_url) as http:
+            users, todos = await seed(http, args)
+            results = await run_all(http, args, users, todos)
+    finally:
+        hashing_executor.shutdown()
+
+    report(
+        {
+            'revision': git_revision(),
+            'target': args.base_url or 'in-process',
+            'concurrency': args.concurrency,
+            'users': args.users,
+            'todos_per_user': args.todos_per_user,
+            'scenarios': results,
+        },
+        args.output,
+    )
+
+
+async def run_all(http, args, users, todos):
+    def user_of(i):
+        return users[i % len(users)]
+
+    def todo_of(i):
+        user = user_of(i)
+        ids = todos[user['email']]
+        return user, ids[(i // len(users)) % len(ids)]
+
+    created: list[tuple[dict, int]] = []
+
+    async def login(i):
+        user = user_of(i)
+        return await http.post(
+            '/auth/token/',
+            data={'username': user['email'], 'password': PASSWORD},
+        )
+
+    async def create_todo(i):
+        user = user_of(i)
+        response = await http.post(
+            '/todos/',
+            json={
+                'title': f'created {i}',
+                'description': 'benchmark',
+                'state': 'draft',
+            },
+            headers=user['headers'],
+        )
+        created.append((user, response.json()['id']))
+        return response
+
+    async def list_todos(i):
+        return await http.get(
+            f'/todos/?limit={args.page_size}', headers=user_of(i)['headers']
+        )
+
+    async def update_todo(i):
+        user, todo_id = todo_of(i)
+        return await http.patch(
+            f'/todos/{todo_id}',
+            json={'state': 'doing' if i % 2 else 'done'},
+            headers=user['headers'],
+        )
+
+    async def delete_todo(i):
+        user, todo_id = created[i]
+        return await http.delete(f'/todos/{todo_id}', headers=user['headers'])
+
+    async def list_users(i):
+        return await http.get(
+            f'/users/?limit={args.page_size}', headers=user_of(i)['headers']
+        )
+
+    scenarios = [
+        ('login', login, args.login_requests),
+        ('create_todo', create_todo, args.requests),
+        ('list_todos', list_todos, args.requests),
+        ('update_todo', update_todo, args.requests),
+        ('delete_todo', delete_todo, args.requests),
+        ('list_users', list_users, args.requests),
+    ]
+
+    results = {}
+    for name, send, total in scenarios:
+        if args.only and name not in args.only:
+            continue
+        # Exclusões consomem os todos criados em create_todo
+        requests = len(created) if send is delete_todo else total
+        results[name] = await run_scenario(requests, args.concurrency, send)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    add_common_arguments(parser)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument(
+        '--login-requests',
+        type=int,
+        default=200,
+        help='Logins are argon2-bound: keep this lower than --requests',
+    )
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--todos-per-user', type=int, default=500)
+    parser.add_argument('--bulk-size', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument(
+        '--only',
+        nargs='+',
+        help='Run only these scenarios (create_todo feeds delete_todo)',
+    )
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+"""
+Latência de uma rota não relacionada (`GET /`) durante uma rajada de logins.
+
+    python -m benchmarks.login_storm --duration 5 --concurrency 32
+
+Compare HASHING_EXECUTOR=process e HASHING_EXECUTOR=thread. A rajada
+precisa chegar ao argon2: em processo o limitador de login é desligado;
+com --base-url suba o servidor com LOGIN_THROTTLE_ENABLED=false.
+"""
+
+import argparse
+import asyncio
+from http import HTTPStatus
+from time import perf_counter
+
+from benchmarks.common import (
+    add_common_arguments,
+    client,
+    prepare_database,
+    report,
+    summarize,
+)
+from fast_zero.security import hashing_executor, login_throttle, settings
+
+USER = {
+    'username': 'bench-login',
+    'email': 'bench-login@example.com',
+    'password': 'bench-secret',
+}
+
+
+async def probe(http, stop: asyncio.Event, interval: float):
+    samples = []
+
+    while not stop.is_set():
+        start = perf_counter()
+        await http.get('/')
+        samples.append(perf_counter() - start)
+        await asyncio.sleep(interval)
+
+    return samples
+
+
+async def login_worker(http, stop: asyncio.Event, statuses: dict):
+    form = {'username': USER['email'], 'password': USER['password']}
+
+    while not stop.is_set():
+        response = await http.post('/auth/token/', data=form)
+        statuses[response.status_code] = (
+            statuses.get(response.status_code, 0) + 1
+        )
+
+
+async def run_phase(http, args, logins: int):
+    stop = asyncio.Event()
+    statuses: dict[int, int] = {}
+
+    probe_task = asyncio.create_task(probe(http, stop, args.probe_interval))
+    workers = [
+        asyncio.create_task(login_worker(http, stop, statuses))
+        for _ in range(logins)
+    ]
+
+    await asyncio.sleep(args.duration)
+    stop.set()
+
+    samples = await probe_task
+    await asyncio.gather(*workers)
+
+    return {
+        'probe': summarize(samples),
+        'logins': {str(status): count for status, count in statuses.items()},
+        'logins_per_second': round(
+            statuses.get(HTTPStatus.OK, 0) / args.duration, 2
+        ),
+    }
+
+
+async def main(args):
+    if not args.base_url:
+        await prepare_database(reset=args.reset)
+        login_throttle.enabled = False
+
+    try:
+        async with client(args.base_url) as http:
+            await http.post('/users/', json=USER)
+
+            results = {
+                'executor': settings.HASHING_EXECUTOR,
+                'concurrency': args.concurrency,
+                'idle': await run_phase(http, args, logins=0),
+                'storm': await run_phase(http, args, logins=args.concurrency),
+            }
+    finally:
+        hashing_executor.shutdown()
+
+    report(results, args.output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_common_arguments(parser)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--probe-interval', type=float, default=0.01)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,190 @@
+"""
+Custo das primitivas de `fast_zero.security`: argon2 (hash e verificação,
+direto e via executor), emissão de JWT e o caminho de decodificação de
+`get_current_user` com o principal (token antigo) ou a versão do token
+(token com claims) em cache.
+
+    python -m benchmarks.security --memory-cost 19456 65536 --time-cost 2 3
+
+Com --target-ms indica a combinação mais cara cuja verificação (p50)
+cabe no alvo; configure-a em ARGON2_TIME_COST, ARGON2_MEMORY_COST e
+ARGON2_PARALLELISM.
+"""
+
+import argparse
+import asyncio
+from itertools import product
+from time import perf_counter
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import report, summarize
+from fast_zero.database import engine
+from fast_zero.hashing import Argon2Params, check_password, hash_password
+from fast_zero.security import (
+    Principal,
+    access_token_claims,
+    argon2_params,
+    create_access_token,
+    get_current_user,
+    get_password_hash,
+    hashing_executor,
+    principal_cache,
+    settings,
+    token_version_cache,
+    verify_password,
+)
+
+PASSWORD = 'bench-secret'
+
+
+def measure(func, repeat: int):
+    samples = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        samples.append(perf_counter() - start)
+
+    return summarize(samples)
+
+
+async def measure_async(func, repeat: int):
+    samples = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        await func()
+        samples.append(perf_counter() - start)
+
+    return summarize(samples)
+
+
+def sweep_argon2(args):
+    results = []
+
+    for time_cost, memory_cost, parallelism in product(
+        args.time_cost, args.memory_cost, args.parallelism
+    ):
+        params = Argon2Params(time_cost, memory_cost, parallelism)
+        hashed = hash_password(PASSWORD, params)
+        results.append({
+            'time_cost': time_cost,
+            'memory_cost': memory_cost,
+            'parallelism': parallelism,
+            'hash': measure(
+                lambda params=params: hash_password(PASSWORD, params),
+                args.repeat,
+            ),
+            'verify': measure(
+                lambda hashed=hashed: check_password(PASSWORD, hashed),
+                args.repeat,
+            ),
+        })
+
+    return results
+
+
+def pick_for_target(sweep: list[dict], target_ms: float):
+    """Combinação mais cara (maior p50) com verificação dentro do alvo."""
+    fitting = [item for item in sweep if item['verify']['p50_ms'] <= target_ms]
+
+    if not fitting:
+        return None
+
+    best = max(fitting, key=lambda item: item['verify']['p50_ms'])
+
+    return {
+        'ARGON2_TIME_COST': best['time_cost'],
+        'ARGON2_MEMORY_COST': best['memory_cost'],
+        'ARGON2_PARALLELISM': best['parallelism'],
+        'verify_p50_ms': best['verify']['p50_ms'],
+    }
+
+
+async def measure_current(args):
+    hashed = await get_password_hash(PASSWORD)
+    principal = Principal(id=1, email='bench@example.com', username='bench')
+    token = create_access_token({'sub': principal.email})
+    principal_cache.set(principal.email, principal)
+    claims_token = create_access_token(access_token_claims(principal))
+    token_version_cache.set(principal.id, principal.token_version)
+
+    async with AsyncSession(engine) as session:
+        decode = await measure_async(
+            lambda: get_current_user(session, token), args.jwt_repeat
+        )
+        decode_claims = await measure_async(
+            lambda: get_current_user(session, claims_token), args.jwt_repeat
+        )
+
+    return {
+        'get_password_hash': await measure_async(
+            lambda: get_password_hash(PASSWORD), args.repeat
+        ),
+        'verify_password': await measure_async(
+            lambda: verify_password(PASSWORD, hashed), args.repeat
+        ),
+        'create_access_token': measure(
+            lambda: create_access_token({'sub': principal.email}),
+            args.jwt_repeat,
+        ),
+        'get_current_user_cached': decode,
+        'get_current_user_claims': decode_claims,
+    }
+
+
+async def main(args):
+    try:
+        current = await measure_current(args)
+    finally:
+        hashing_executor.shutdown()
+
+    sweep = sweep_argon2(args)
+    results = {
+        'executor': settings.HASHING_EXECUTOR,
+        'argon2_params': {
+            'time_cost': argon2_params.time_cost,
+            'memory_cost': argon2_params.memory_cost,
+            'parallelism': argon2_params.parallelism,
+        },
+        'current': current,
+        'argon2_sweep': sweep,
+    }
+
+    if args.target_ms:
+        results['suggested'] = pick_for_target(sweep, args.target_ms)
+
+    report(results, args.output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--output', help='Write the JSON results to a file')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--jwt-repeat', type=int, default=5000)
+    parser.add_argument(
+        '--time-cost', type=int, nargs='+', default=[argon2_params.time_cost]
+    )
+    parser.add_argument(
+        '--memory-cost',
+        type=int,
+        nargs='+',
+        default=[argon2_params.memory_cost],
+        help='KiB',
+    )
+    parser.add_argument(
+        '--parallelism',
+        type=int,
+        nargs='+',
+        default=[argon2_params.parallelism],
+    )
+    parser.add_argument(
+        '--target-ms',
+        type=float,
+        help='Suggest the costliest parameters verifying within this time',
+    )
+
+    asyncio.run(main(parser.parse_args()))
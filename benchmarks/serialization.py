@@ -0,0 +1,140 @@
+"""
+Custo de serializar uma página de `GET /todos/`: o caminho padrão do
+FastAPI (objetos ORM validados por `TodoList` e codificados pelo
+JSONResponse) contra o caminho atual (colunas projetadas e
+TrustedJSONResponse com serializador tipado, sem validação).
+
+    python -m benchmarks.serialization --page-size 10 100 1000
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import (
+    add_common_arguments,
+    prepare_database,
+    report,
+    summarize,
+)
+from fast_zero.app import app
+from fast_zero.database import engine
+from fast_zero.models import Todo, User
+from fast_zero.responses import TrustedJSONResponse, rows_as_dicts
+from fast_zero.routers.todos import PAGE_SERIALIZER, PUBLIC_COLUMNS
+
+EMAIL = 'bench-serialization@example.com'
+
+
+def list_todos_field():
+    for route in app.routes:
+        if route.path == '/todos/' and 'GET' in route.methods:
+            return route.response_field
+
+    raise LookupError('GET /todos/ not found')
+
+
+async def seed(session, total: int):
+    user = await session.scalar(select(User).where(User.email == EMAIL))
+    if not user:
+        user = User('bench-serialization', EMAIL, 'x')
+        session.add(user)
+        await session.flush()
+
+    existing = await session.scalar(
+        select(Todo.id).where(Todo.user_id == user.id).offset(total - 1)
+    )
+    if existing is None:
+        await session.execute(
+            insert(Todo),
+            [
+                {
+                    'title': f'todo {n}',
+                    'description': f'serialization benchmark {n}',
+                    'state': 'todo',
+                    'user_id': user.id,
+                }
+                for n in range(total)
+            ],
+        )
+    await session.commit()
+
+    return user.id
+
+
+async def measure(func, repeat: int):
+    samples = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        await func()
+        samples.append(perf_counter() - start)
+
+    return summarize(samples)
+
+
+async def compare(session, user_id: int, page_size: int, repeat: int):
+    field = list_todos_field()
+    query = select(Todo).where(Todo.user_id == user_id).limit(page_size)
+    todos = (await session.scalars(query)).all()
+    rows = (
+        await session.execute(
+            select(*PUBLIC_COLUMNS)
+            .where(Todo.user_id == user_id)
+            .limit(page_size)
+        )
+    ).all()
+
+    async def default_path():
+        content = await serialize_response(
+            field=field,
+            response_content={'todos': todos, 'next_cursor': None},
+        )
+        return JSONResponse(content).body
+
+    async def trusted_path():
+        return TrustedJSONResponse(
+            {'todos': rows_as_dicts(rows), 'next_cursor': None},
+            serializer=PAGE_SERIALIZER,
+        ).body
+
+    default = await measure(default_path, repeat)
+    trusted = await measure(trusted_path, repeat)
+
+    return {
+        'default': default,
+        'trusted': trusted,
+        'speedup_p50': round(default['p50_ms'] / trusted['p50_ms'], 2),
+        'bytes': len(await trusted_path()),
+    }
+
+
+async def main(args):
+    await prepare_database(reset=args.reset)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user_id = await seed(session, max(args.page_size))
+        results = {
+            f'page_{size}': await compare(session, user_id, size, args.repeat)
+            for size in args.page_size
+        }
+
+    report(results, args.output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    add_common_arguments(parser)
+    parser.add_argument(
+        '--page-size', type=int, nargs='+', default=[10, 100, 1000]
+    )
+    parser.add_argument('--repeat', type=int, default=500)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,102 @@
+"""
+Latência de `GET /users/` no início e no fim de uma tabela grande,
+comparando paginação por offset e por cursor.
+
+    python -m benchmarks.users_pagination --users 1000000
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from sqlalchemy import func, select, text
+
+from benchmarks.common import (
+    add_common_arguments,
+    client,
+    prepare_database,
+    report,
+    summarize,
+)
+from fast_zero.database import engine
+from fast_zero.models import User
+from fast_zero.pagination import encode_cursor
+from fast_zero.security import create_access_token
+
+SEED_USERS = text("""
+    INSERT INTO users (username, email, password)
+    SELECT 'bench-user-' || n, 'bench-user-' || n || '@example.com', 'x'
+    FROM generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS n
+""")
+
+
+async def seed_users(total: int):
+    async with engine.begin() as conn:
+        existing = await conn.scalar(select(func.count(User.id)))
+
+        if existing < total:
+            await conn.execute(
+                SEED_USERS, {'start': existing + 1, 'stop': total}
+            )
+
+        return await conn.scalar(select(User.email).order_by(User.id))
+
+
+async def measure(http, url: str, headers: dict, repeat: int):
+    samples = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        response = await http.get(url, headers=headers)
+        samples.append(perf_counter() - start)
+        response.raise_for_status()
+
+    return summarize(samples)
+
+
+async def main(args):
+    await prepare_database(reset=args.reset)
+    email = await seed_users(args.users)
+
+    async with engine.connect() as conn:
+        deep_id = await conn.scalar(
+            select(User.id).order_by(User.id).offset(args.users - args.limit)
+        )
+
+    token = create_access_token({'sub': email})
+    headers = {'Authorization': f'Bearer {token}'}
+    deep_offset = args.users - args.limit
+    cursor = encode_cursor(deep_id - 1)
+
+    async with client(args.base_url) as http:
+        results = {
+            'users': args.users,
+            'limit': args.limit,
+            'offset_0': await measure(
+                http, f'/users/?limit={args.limit}', headers, args.repeat
+            ),
+            f'offset_{deep_offset}': await measure(
+                http,
+                f'/users/?limit={args.limit}&skip={deep_offset}',
+                headers,
+                args.repeat,
+            ),
+            f'cursor_{deep_offset}': await measure(
+                http,
+                f'/users/?limit={args.limit}&cursor={cursor}',
+                headers,
+                args.repeat,
+            ),
+        }
+
+    report(results, args.output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_common_arguments(parser)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+
+    asyncio.run(main(parser.parse_args()))
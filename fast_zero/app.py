@@ -1,15 +1,72 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from http import HTTPStatus
+from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse
 
-from fast_zero.routers import auth, todos, users
+from fast_zero.cache import render_caches
+from fast_zero.compression import CompressionMiddleware, compressors
+from fast_zero.metrics import MetricsMiddleware, RequestMetrics
+from fast_zero.pages import StaticPage
+from fast_zero.purge import trash_purger
+from fast_zero.routers import auth, internal, todos, users
 from fast_zero.schemas import Message
+from fast_zero.security import (
+    hashing_executor,
+    login_throttle,
+    principal_cache,
+    token_version_cache,
+)
+from fast_zero.settings import Settings
+from fast_zero.statements import StatementStatsMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    purge_task = None
+
+    if settings.TRASH_PURGE_ENABLED:
+        # Um por worker: o SKIP LOCKED evita que disputem as mesmas linhas
+        purge_task = asyncio.create_task(
+            trash_purger.run_forever(settings.TRASH_PURGE_INTERVAL_SECONDS)
+        )
+
+    yield
+
+    if purge_task:
+        purge_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await purge_task
+
+    hashing_executor.shutdown()
+
+
+settings = Settings()
+request_metrics = RequestMetrics()
+root_page = StaticPage(
+    Path(__file__).parent / 'root.html',
+    max_age=settings.HTML_MAX_AGE_SECONDS,
+    reload=settings.HTML_RELOAD,
+)
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    media_types=tuple(settings.COMPRESSION_MEDIA_TYPES),
+    available=compressors(
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    ),
+)
+app.add_middleware(StatementStatsMiddleware)
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(todos.router)
+app.include_router(internal.router)
 
 
 @app.get('/', status_code=HTTPStatus.OK, response_model=Message)
@@ -17,10 +74,24 @@ def read_root():
     return {'message': 'Olá, mundo!'}
 
 
+@app.get('/metrics', include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(
+        request_metrics.render()
+        + render_caches({
+            'principal': principal_cache,
+            'token_version': token_version_cache,
+        })
+        + hashing_executor.render()
+        + login_throttle.render()
+        + trash_purger.render(),
+        media_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
 @app.get('/html', status_code=HTTPStatus.OK, response_class=HTMLResponse)
-def read_root_html():
+async def read_root_html(request: Request):
     """
     Retorna o root no formato HTML
     """
-    out = open('fast_zero/root.html', 'r', encoding='utf-8')
-    return HTMLResponse(out.read(), status_code=HTTPStatus.OK)
+    return root_page.response(request)
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from time import monotonic
+
+
+class TTLCache:
+    """
+    Cache LRU em memória com expiração por tempo (TTL).
+
+    Não é compartilhado entre processos: cada worker mantém o seu.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+
+        if item is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = item
+
+        if expires_at <= monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = (value, monotonic() + self.ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+
+# (nome, tipo, descrição, chave de TTLCache.stats())
+CACHE_METRICS = (
+    ('cache_hits_total', 'counter', 'Cache hits.', 'hits'),
+    ('cache_misses_total', 'counter', 'Cache misses.', 'misses'),
+    ('cache_evictions_total', 'counter', 'LRU evictions.', 'evictions'),
+    ('cache_size', 'gauge', 'Entries in the cache.', 'size'),
+    ('cache_max_size', 'gauge', 'Cache capacity.', 'maxsize'),
+)
+
+
+def render_caches(caches: dict[str, TTLCache]) -> str:
+    """Estatísticas de `caches` ({nome: cache}) no formato do Prometheus."""
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    lines = []
+    for metric, kind, description, key in CACHE_METRICS:
+        lines += [f'# HELP {metric} {description}', f'# TYPE {metric} {kind}']
+        lines += [
+            f'{metric}{{cache="{name}"}} {values[key]}'
+            for name, values in sorted(stats.items())
+        ]
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,178 @@
+import zlib
+
+import zstandard
+
+from fast_zero.http_cache import negotiate_encoding
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31: formato gzip (cabeçalho e CRC), não zlib puro
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush: cada chunk de um streaming sai decodificável
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b'') -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b'') -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def compressors(gzip_level: int = 6, zstd_level: int = 3):
+    """Fábricas de compressores disponíveis, em ordem de preferência."""
+    available = {
+        'zstd': lambda: _ZstdCompressor(zstd_level),
+        'gzip': lambda: _GzipCompressor(gzip_level),
+    }
+
+    return available
+
+
+class CompressionMiddleware:
+    """
+    Comprime respostas dos `media_types` com zstd ou gzip, conforme o
+    Accept-Encoding.
+
+    Respostas de um único corpo abaixo de `minimum_size` bytes saem
+    intactas. Em streaming cada chunk é comprimido e enviado logo, sem
+    bufferizar o corpo inteiro.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        media_types: tuple[str, ...] = ('application/json',),
+        available: dict | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = media_types
+        self.available = available or compressors()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        accept = ''
+        for name, value in scope['headers']:
+            if name == b'accept-encoding':
+                accept = value.decode('latin-1')
+
+        encoding = negotiate_encoding(accept, self.available)
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send, self, encoding, self.available[encoding]
+        )
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, send, middleware, encoding, compressor_factory):
+        self.send = send
+        self.middleware = middleware
+        self.encoding = encoding
+        self.compressor_factory = compressor_factory
+        self.start = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _eligible(self, headers):
+        content_type = b''
+        for name, value in headers:
+            if name == b'content-encoding':
+                return False
+            if name == b'content-type':
+                content_type = value
+
+        media_type = content_type.split(b';')[0].strip().decode('latin-1')
+
+        return media_type in self.middleware.media_types
+
+    def _headers(self, length: int | None):
+        headers = [
+            (name, value)
+            for name, value in self.start['headers']
+            if name not in {b'content-length', b'vary'}
+        ]
+        vary = [
+            value for name, value in self.start['headers'] if name == b'vary'
+        ]
+        headers += [
+            (b'content-encoding', self.encoding.encode()),
+            (b'vary', b', '.join([*vary, b'Accept-Encoding'])),
+        ]
+        if length is not None:
+            headers.append((b'content-length', str(length).encode()))
+
+        return headers
+
+    async def __call__(self, message):
+        if message['type'] == 'http.response.start':
+            # Os headers dependem do primeiro chunk do corpo
+            self.start = message
+            self.passthrough = not self._eligible(message.get('headers', []))
+            return
+
+        if message['type'] != 'http.response.body' or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._flush_start()
+                await self.send(message)
+                return
+
+            self.compressor = self.compressor_factory()
+
+            if not more_body:
+                body = self.compressor.finish(body)
+                self.start['headers'] = self._headers(len(body))
+                await self._flush_start()
+                await self.send({'type': 'http.response.body', 'body': body})
+                return
+
+            self.start['headers'] = self._headers(None)
+            await self._flush_start()
+
+        if more_body:
+            chunk = self.compressor.compress(body)
+        else:
+            chunk = self.compressor.finish(body)
+
+        await self.send({
+            'type': 'http.response.body',
+            'body': chunk,
+            'more_body': more_body,
+        })
+
+    async def _flush_start(self):
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
@@ -0,0 +1,122 @@
+"""
+Contadores de todos por usuário e estado (tabela todo_counters).
+
+As rotas aplicam deltas na mesma transação da escrita; para recalcular
+tudo a partir da tabela todos:
+
+    python -m fast_zero.counters [--user-id ID]
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.database import engine
+from fast_zero.models import Todo, TodoCounter, TodoState
+
+
+async def apply_deltas(session: AsyncSession, user_id: int, deltas: Counter):
+    """Soma `deltas` ({estado: delta}) aos contadores, num único upsert."""
+    # Ordem fixa das linhas: evita deadlock entre transações concorrentes
+    rows = [
+        {'user_id': user_id, 'state': state, 'count': delta}
+        for state, delta in sorted(deltas.items())
+        if delta
+    ]
+
+    if not rows:
+        return
+
+    statement = pg_insert(TodoCounter).values(rows)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[TodoCounter.user_id, TodoCounter.state],
+            set_={'count': TodoCounter.count + statement.excluded.count},
+        )
+    )
+
+
+def removed(states):
+    """Deltas da remoção de todos com os `states` dados."""
+    deltas = Counter()
+
+    for state in states:
+        deltas[state] -= 1
+
+    return deltas
+
+
+def state_changes(old_states, new_state: TodoState | None):
+    """Deltas de uma mudança de estado; vazio se `new_state` é None."""
+    deltas = Counter()
+
+    if new_state is None:
+        return deltas
+
+    for state in old_states:
+        deltas[state] -= 1
+        deltas[new_state] += 1
+
+    return deltas
+
+
+async def read_counts(session: AsyncSession, user_id: int):
+    rows = await session.execute(
+        select(TodoCounter.state, TodoCounter.count).where(
+            TodoCounter.user_id == user_id
+        )
+    )
+    counts = dict.fromkeys(TodoState, 0)
+    counts.update(rows.tuples().all())
+
+    return counts
+
+
+async def repair(session: AsyncSession, user_id: int | None = None):
+    """
+    Recalcula os contadores a partir de todos, em lote.
+
+    Bloqueia escritas nos contadores durante o recálculo: transações que
+    ainda vão aplicar deltas esperam e somam sobre o valor recalculado.
+    Retorna o número de linhas gravadas.
+    """
+    await session.execute(text('LOCK TABLE todo_counters IN EXCLUSIVE MODE'))
+
+    counters = delete(TodoCounter)
+    totals = select(Todo.user_id, Todo.state, func.count()).group_by(
+        Todo.user_id, Todo.state
+    )
+
+    if user_id is not None:
+        counters = counters.where(TodoCounter.user_id == user_id)
+        totals = totals.where(Todo.user_id == user_id)
+
+    await session.execute(counters)
+    result = await session.execute(
+        insert(TodoCounter)
+        .from_select(['user_id', 'state', 'count'], totals)
+        .returning(TodoCounter.user_id)
+    )
+    rows = len(result.all())
+    await session.commit()
+
+    return rows
+
+
+async def main(args):  # pragma: no cover
+    async with AsyncSession(engine) as session:
+        rows = await repair(session, args.user_id)
+
+    await engine.dispose()
+    print(f'{rows} counter rows rebuilt')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--user-id', type=int)
+
+    asyncio.run(main(parser.parse_args()))
@@ -1,8 +1,146 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from itertools import count
+from time import perf_counter
 
+from sqlalchemy import event, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from fast_zero.cache import TTLCache
+from fast_zero.metrics import Histogram
 from fast_zero.settings import Settings
+from fast_zero.statements import instrument_engine
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Pool que mede quanto tempo cada checkout espera por uma conexão.
+
+    As métricas ficam em atributos de classe para sobreviver ao
+    `recreate()` do SQLAlchemy; use `instrumented_pool()` para obter uma
+    subclasse própria por engine.
+    """
+
+    wait: Histogram
+    timeouts: int
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            type(self).timeouts += 1
+            raise
+        finally:
+            self.wait.observe(perf_counter() - start)
+
+
+def instrumented_pool():
+    return type(
+        'InstrumentedPool',
+        (InstrumentedPool,),
+        {'wait': Histogram(), 'timeouts': 0},
+    )
+
+
+def create_engine(url: str, settings: Settings) -> AsyncEngine:
+    connect_args = {}
+    if make_url(url).get_driver_name() == 'psycopg':
+        # None desliga os prepared statements (ex.: pgbouncer em transação)
+        connect_args['prepare_threshold'] = settings.DATABASE_PREPARE_THRESHOLD
+
+    engine = create_async_engine(
+        url,
+        poolclass=instrumented_pool(),
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    instrument_engine(engine, settings.SLOW_QUERY_THRESHOLD_MS)
+
+    return engine
+
+
+def pool_stats(engine: AsyncEngine):
+    pool = engine.pool
+
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        # Negativo enquanto o pool base ainda não abriu todas as conexões
+        'overflow': max(pool.overflow(), 0),
+        'timeouts': pool.timeouts,
+        'wait_seconds': pool.wait.snapshot(),
+    }
+
+
+class ReadRouter:
+    """
+    Escolhe a engine das leituras: réplicas em round-robin.
+
+    Quem escreveu há menos de `window` segundos lê do primário
+    (read-your-writes). Réplicas que falham ao conectar ficam fora da
+    rotação por `retry_after` segundos.
+    """
+
+    def __init__(
+        self,
+        replicas: list[AsyncEngine],
+        window: float,
+        retry_after: float,
+        max_writers: int = 100_000,
+    ):
+        self.replicas = replicas
+        self.fallbacks = 0
+        self._turn = count()
+        self._writers = TTLCache(maxsize=max_writers, ttl=window)
+        self._down = TTLCache(maxsize=len(replicas), ttl=retry_after)
+
+    def mark_write(self, key):
+        self._writers.set(key, True)
+
+    def mark_down(self, replica: AsyncEngine):
+        self._down.set(id(replica), True)
+        self.fallbacks += 1
+
+    def candidates(self, key) -> list[AsyncEngine]:
+        """Réplicas a tentar, em ordem; vazia quando deve ler do primário."""
+        if not self.replicas or self._writers.get(key):
+            return []
+
+        start = next(self._turn) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+
+        return [
+            replica for replica in ordered if not self._down.get(id(replica))
+        ]
+
+
+settings = Settings()
+engine = create_engine(settings.DATABASE_URL, settings)
+read_router = ReadRouter(
+    [create_engine(url, settings) for url in settings.DATABASE_REPLICA_URLS],
+    window=settings.READ_YOUR_WRITES_SECONDS,
+    retry_after=settings.DATABASE_REPLICA_RETRY_SECONDS,
+)
+
+
+@event.listens_for(Session, 'after_commit')
+def _mark_write(session):
+    # `principal_id` é preenchido por get_current_user na sessão do request
+    principal_id = session.info.get('principal_id')
 
-engine = create_async_engine(Settings().DATABASE_URL)
+    if principal_id is not None:
+        read_router.mark_write(principal_id)
 
 
 async def get_session():  # pragma: no cover
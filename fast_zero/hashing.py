@@ -0,0 +1,150 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import cache
+
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+# Este módulo é importado pelos processos do pool: mantenha-o leve.
+# Os parâmetros chegam como argumento, os workers não leem Settings.
+
+
+@dataclass(frozen=True, slots=True)
+class Argon2Params:
+    """Custo do argon2id; `memory_cost` em KiB."""
+
+    time_cost: int = 3
+    memory_cost: int = 65536
+    parallelism: int = 4
+
+
+@cache
+def _password_hash(params: Argon2Params):
+    return PasswordHash((
+        Argon2Hasher(
+            time_cost=params.time_cost,
+            memory_cost=params.memory_cost,
+            parallelism=params.parallelism,
+        ),
+    ))
+
+
+def hash_password(password: str, params: Argon2Params = Argon2Params()):
+    return _password_hash(params).hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str):
+    # Os parâmetros do hash armazenado vêm no próprio hash
+    return _password_hash(Argon2Params()).verify(
+        plain_password, hashed_password
+    )
+
+
+def check_and_update_password(
+    plain_password: str,
+    hashed_password: str,
+    params: Argon2Params = Argon2Params(),
+):
+    """
+    Verifica a senha e, se o hash usa parâmetros diferentes de `params`,
+    devolve um novo hash: `(válida, novo_hash | None)`.
+    """
+    return _password_hash(params).verify_and_update(
+        plain_password, hashed_password
+    )
+
+
+class HashingPoolSaturated(Exception):
+    """Fila do pool de hashing cheia."""
+
+
+class HashingPoolBroken(HashingPoolSaturated):
+    """Um worker do pool morreu; o pool é recriado na próxima tarefa."""
+
+
+class HashingExecutor:
+    """
+    Executa o argon2 fora do event loop, em processos (padrão) ou threads.
+
+    O número de tarefas pendentes é limitado por `max_pending`; acima dele
+    `run` levanta HashingPoolSaturated em vez de enfileirar.
+    """
+
+    def __init__(
+        self,
+        kind: str = 'process',
+        max_workers: int | None = None,
+        max_pending: int = 64,
+    ):
+        if kind not in {'process', 'thread'}:
+            raise ValueError(f'Unknown hashing executor: {kind}')
+
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._executor: Executor | None = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == 'process':
+                # spawn: fork de um processo com threads pode travar
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='hashing',
+                )
+
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingPoolSaturated
+
+        self.pending += 1
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool as exc:
+            # Ex.: worker morto por OOM; o pool quebrado não se recupera
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self.restarts += 1
+            raise HashingPoolBroken from exc
+        finally:
+            self.pending -= 1
+
+    def render(self) -> str:
+        return (
+            '# HELP hashing_rejected_total Jobs rejected, queue full.\n'
+            '# TYPE hashing_rejected_total counter\n'
+            f'hashing_rejected_total {self.rejected}\n'
+            '# HELP hashing_pending Hashing jobs queued or running.\n'
+            '# TYPE hashing_pending gauge\n'
+            f'hashing_pending {self.pending}\n'
+            '# HELP hashing_pool_restarts_total Broken pools replaced.\n'
+            '# TYPE hashing_pool_restarts_total counter\n'
+            f'hashing_pool_restarts_total {self.restarts}\n'
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
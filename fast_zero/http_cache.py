@@ -0,0 +1,66 @@
+from hashlib import blake2b
+from http import HTTPStatus
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    digest = blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110, 13.1.2)."""
+    header = request.headers.get('if-none-match')
+
+    if not header:
+        return False
+
+    if header.strip() == '*':
+        return True
+
+    opaque = etag.removeprefix('W/')
+
+    return any(
+        tag.strip().removeprefix('W/') == opaque for tag in header.split(',')
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=HTTPStatus.NOT_MODIFIED,
+        headers={'ETag': etag, 'Cache-Control': 'private, no-cache'},
+    )
+
+
+def set_etag(response: Response, etag: str):
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'private, no-cache'
+
+
+def negotiate_encoding(accept_encoding: str, supported) -> str | None:
+    """
+    Escolhe a codificação de `supported` (em ordem de preferência do
+    servidor) com maior q no Accept-Encoding; None para identity.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported:
+        quality = weights.get(coding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+
+    return best
@@ -0,0 +1,182 @@
+from bisect import bisect_left
+from http import HTTPStatus
+from time import perf_counter
+
+# Limites (em segundos) pensados para latências de banco e HTTP
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else str(bound)
+
+
+class Histogram:
+    """
+    Histograma pré-agregado em buckets fixos, no formato do Prometheus.
+
+    `observe` custa uma busca binária e um incremento: seguro para o
+    caminho quente. Não é compartilhado entre processos.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Pares (limite, contagem acumulada), terminando em +Inf."""
+        total = 0
+        out = []
+        for bound, count in zip(
+            (*self.buckets, float('inf')), self._counts, strict=True
+        ):
+            total += count
+            out.append((bound, total))
+
+        return out
+
+    def snapshot(self):
+        return {
+            'buckets': {
+                format_bound(bound): total
+                for bound, total in self.cumulative()
+            },
+            'count': self.count,
+            'sum': self.sum,
+        }
+
+    def reset(self):
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+def _labels(**labels):
+    escaped = (
+        (name, value.replace('\\', r'\\').replace('"', r'\"'))
+        for name, value in labels.items()
+    )
+
+    return ','.join(f'{name}="{value}"' for name, value in escaped)
+
+
+class _RouteMetrics:
+    __slots__ = ('latency', 'statuses')
+
+    def __init__(self, buckets):
+        self.latency = Histogram(buckets)
+        self.statuses: dict[int, int] = {}
+
+
+class RequestMetrics:
+    """Contagem por status e latência por (método, rota templada)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float):
+        metrics = self._routes.get((method, route))
+
+        if metrics is None:
+            metrics = self._routes[method, route] = _RouteMetrics(self.buckets)
+
+        metrics.latency.observe(seconds)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def render(self) -> str:
+        """Formato de exposição em texto do Prometheus (0.0.4)."""
+        lines = [
+            '# HELP http_requests_total Requests by route and status.',
+            '# TYPE http_requests_total counter',
+        ]
+        for (method, route), metrics in sorted(self._routes.items()):
+            for status, total in sorted(metrics.statuses.items()):
+                labels = _labels(
+                    method=method, route=route, status=str(status)
+                )
+                lines.append(f'http_requests_total{{{labels}}} {total}')
+
+        lines += [
+            '# HELP http_request_duration_seconds Request latency by route.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for (method, route), metrics in sorted(self._routes.items()):
+            latency = metrics.latency
+            for bound, total in latency.cumulative():
+                labels = _labels(
+                    method=method, route=route, le=format_bound(bound)
+                )
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels}}} {total}'
+                )
+
+            labels = _labels(method=method, route=route)
+            lines += [
+                f'http_request_duration_seconds_sum{{{labels}}} {latency.sum}',
+                f'http_request_duration_seconds_count{{{labels}}} '
+                f'{latency.count}',
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        self._routes.clear()
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que alimenta um RequestMetrics.
+
+    Usa o path templado da rota (`/todos/{todo_id}`), nunca o path
+    bruto, para manter a cardinalidade limitada.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get('route')
+            self.metrics.observe(
+                scope['method'],
+                route.path if route else 'unmatched',
+                int(status),
+                perf_counter() - start,
+            )
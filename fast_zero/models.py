@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
 
 table_registry = registry()
@@ -20,11 +20,17 @@ class TodoState(str, Enum):
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    # INSERT/UPDATE ... RETURNING dos defaults: dispensa o refresh
+    __mapper_args__ = {'eager_defaults': True}
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     username: Mapped[str] = mapped_column(unique=True)
     email: Mapped[str] = mapped_column(unique=True)
     password: Mapped[str]
+    # Incrementado para revogar os tokens emitidos (claim `ver`)
+    token_version: Mapped[int] = mapped_column(
+        init=False, default=0, server_default='0'
+    )
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
@@ -32,21 +38,40 @@ class User:
         init=False, server_default=func.now(), onupdate=func.now()
     )
 
+    # Carregamento opt-in: use selectinload(User.todos) onde for necessário.
+    # Ao apagar o usuário o banco remove os todos (ON DELETE CASCADE)
     todos: Mapped[list[Todo]] = relationship(
-        init=False, cascade='all, delete-orphan', lazy='selectin'
+        init=False,
+        cascade='all, delete-orphan',
+        lazy='raise',
+        passive_deletes=True,
     )
 
 
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = 'todos'
+    __table_args__ = (
+        Index('ix_todos_user_id_id', 'user_id', 'id'),
+        # Validador do ETag (count + max(updated_at)) via index-only scan
+        Index('ix_todos_user_id_updated_at', 'user_id', 'updated_at'),
+        # Lotes do expurgo da lixeira: percorre só os todos em trash
+        Index(
+            'ix_todos_trash_id',
+            'id',
+            postgresql_where=text("state = 'trash'"),
+        ),
+    )
+    __mapper_args__ = {'eager_defaults': True}
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
     description: Mapped[str]
     state: Mapped[TodoState]
 
-    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE')
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -54,3 +79,21 @@ class Todo:
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+
+
+@table_registry.mapped_as_dataclass
+class TodoCounter:
+    """
+    Quantidade de todos por usuário e estado.
+
+    Mantida incrementalmente pelas rotas de todos (ver fast_zero.counters);
+    some junto com o usuário pelo ON DELETE CASCADE.
+    """
+
+    __tablename__ = 'todo_counters'
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), primary_key=True
+    )
+    state: Mapped[TodoState] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0, server_default='0')
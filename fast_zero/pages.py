@@ -0,0 +1,65 @@
+import gzip
+from hashlib import blake2b
+from http import HTTPStatus
+from pathlib import Path
+
+import brotli
+from fastapi import Request, Response
+from fastapi.responses import HTMLResponse
+
+from fast_zero.http_cache import etag_matches, negotiate_encoding
+
+
+class StaticPage:
+    """
+    Página lida uma vez e servida da memória, com ETag, Cache-Control e
+    variantes pré-comprimidas (brotli e gzip).
+
+    Com `reload=True` (desenvolvimento) o arquivo é relido quando muda.
+    """
+
+    def __init__(self, path: Path, max_age: int, reload: bool = False):
+        self.path = path
+        self.max_age = max_age
+        self.reload = reload
+        self.load()
+
+    def load(self):
+        body = self.path.read_bytes()
+        self._mtime = self.path.stat().st_mtime_ns
+        self.etag = f'W/"{blake2b(body, digest_size=16).hexdigest()}"'
+        # Ordem de preferência do servidor na negociação
+        self.variants = {
+            'br': brotli.compress(body),
+            'gzip': gzip.compress(body, mtime=0),
+        }
+        self.body = body
+
+    def _reload_if_changed(self):
+        if self.reload and self.path.stat().st_mtime_ns != self._mtime:
+            self.load()
+
+    def response(self, request: Request) -> Response:
+        self._reload_if_changed()
+
+        headers = {
+            'ETag': self.etag,
+            'Cache-Control': f'public, max-age={self.max_age}',
+            'Vary': 'Accept-Encoding',
+        }
+
+        if etag_matches(request, self.etag):
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED, headers=headers
+            )
+
+        encoding = negotiate_encoding(
+            request.headers.get('accept-encoding', ''), self.variants
+        )
+
+        if encoding is None:
+            return HTMLResponse(self.body, headers=headers)
+
+        headers['Content-Encoding'] = encoding
+
+        return HTMLResponse(self.variants[encoding], headers=headers)
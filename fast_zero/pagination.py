@@ -0,0 +1,48 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+
+def encode_cursor(last_id: int) -> str:
+    return urlsafe_b64encode(f'id:{last_id}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        prefix, value = urlsafe_b64decode(padded).decode().split(':')
+
+        if prefix != 'id':
+            raise ValueError(prefix)
+
+        return int(value)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(
+            HTTPStatus.UNPROCESSABLE_ENTITY, detail='Invalid cursor'
+        )
+
+
+def paginate(query, key, *, cursor: str | None, offset: int, limit: int):
+    """
+    Ordena por `key` e aplica keyset (com cursor) ou offset.
+
+    Busca uma linha a mais para saber se existe próxima página.
+    """
+    if cursor:
+        query = query.where(key > decode_cursor(cursor))
+    else:
+        query = query.offset(offset)
+
+    return query.order_by(key).limit(limit + 1)
+
+
+def next_page(rows, limit: int, key_of):
+    """Corta a linha extra e monta o `next_cursor`, se houver."""
+    if limit <= 0 or len(rows) <= limit:
+        return rows[:limit], None
+
+    page = rows[:limit]
+
+    return page, encode_cursor(key_of(page[-1]))
@@ -0,0 +1,188 @@
+"""
+Expurgo dos todos na lixeira há mais que a retenção configurada.
+
+Apaga em lotes pequenos, em ordem de id, pulando linhas travadas por
+outras transações (SKIP LOCKED) e pausando entre os lotes. Roda no
+lifespan do app (TRASH_PURGE_ENABLED) ou avulso:
+
+    python -m fast_zero.purge [--loop]
+"""
+
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from time import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from fast_zero.counters import apply_deltas, removed
+from fast_zero.database import engine, settings
+from fast_zero.models import Todo, TodoState
+
+logger = logging.getLogger(__name__)
+# (nome, tipo, descrição, campo de PurgeStats)
+METRICS = (
+    ('todos_purged_total', 'counter', 'Trashed todos purged.', 'deleted'),
+    ('todo_purge_batches_total', 'counter', 'Purge batches.', 'batches'),
+    ('todo_purge_runs_total', 'counter', 'Completed purge runs.', 'runs'),
+    ('todo_purge_failures_total', 'counter', 'Failed purge runs.', 'failures'),
+    (
+        'todo_purge_last_run_deleted',
+        'gauge',
+        'Todos purged by the last run.',
+        'last_run_deleted',
+    ),
+    (
+        'todo_purge_last_run_timestamp_seconds',
+        'gauge',
+        'End of the last purge run.',
+        'last_run_at',
+    ),
+)
+
+
+@dataclass(slots=True)
+class PurgeStats:
+    runs: int = 0
+    batches: int = 0
+    deleted: int = 0
+    failures: int = 0
+    last_run_deleted: int = 0
+    last_run_at: float = 0
+
+
+class TrashPurger:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        retention: timedelta,
+        batch_size: int = 500,
+        pause: float = 0.1,
+    ):
+        self.engine = engine
+        self.retention = retention
+        self.batch_size = batch_size
+        self.pause = pause
+        self.stats = PurgeStats()
+
+    async def _delete_batch(self, session: AsyncSession, after_id: int):
+        """Apaga um lote com id > `after_id`; retorna os ids apagados."""
+        batch = (
+            select(Todo.id)
+            .where(
+                Todo.state == TodoState.trash,
+                Todo.updated_at < func.now() - self.retention,
+                Todo.id > after_id,
+            )
+            .order_by(Todo.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .cte('batch')
+        )
+        result = await session.execute(
+            delete(Todo)
+            .where(Todo.id.in_(select(batch.c.id)))
+            .returning(Todo.id, Todo.user_id, Todo.state)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+
+        states = defaultdict(list)
+        for _, user_id, state in rows:
+            states[user_id].append(state)
+
+        # Mesma ordem de usuários em todo lote: evita deadlock
+        for user_id in sorted(states):
+            await apply_deltas(session, user_id, removed(states[user_id]))
+
+        await session.commit()
+
+        return [id for id, _, _ in rows]
+
+    async def run_once(self):
+        """Expurga até esgotar os candidatos; retorna quantos apagou."""
+        deleted = 0
+        after_id = 0
+
+        async with AsyncSession(self.engine) as session:
+            while True:
+                ids = await self._delete_batch(session, after_id)
+
+                if not ids:
+                    break
+
+                deleted += len(ids)
+                after_id = max(ids)
+                self.stats.batches += 1
+                self.stats.deleted += len(ids)
+
+                if len(ids) < self.batch_size:
+                    break
+
+                await asyncio.sleep(self.pause)
+
+        self.stats.runs += 1
+        self.stats.last_run_deleted = deleted
+        self.stats.last_run_at = time()
+
+        return deleted
+
+    async def run_forever(self, interval: float):
+        while True:
+            try:
+                deleted = await self.run_once()
+            except Exception:
+                self.stats.failures += 1
+                logger.exception('Trash purge failed')
+            else:
+                if deleted:
+                    logger.info('Purged %d trashed todos', deleted)
+
+            await asyncio.sleep(interval)
+
+    def render(self) -> str:
+        """Métricas de progresso no formato de texto do Prometheus."""
+        lines = []
+        for name, kind, description, field in METRICS:
+            lines += [
+                f'# HELP {name} {description}',
+                f'# TYPE {name} {kind}',
+                f'{name} {getattr(self.stats, field)}',
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+
+trash_purger = TrashPurger(
+    engine,
+    retention=timedelta(days=settings.TRASH_RETENTION_DAYS),
+    batch_size=settings.TRASH_PURGE_BATCH_SIZE,
+    pause=settings.TRASH_PURGE_PAUSE_SECONDS,
+)
+
+
+async def main(args):  # pragma: no cover
+    try:
+        if args.loop:
+            await trash_purger.run_forever(
+                settings.TRASH_PURGE_INTERVAL_SECONDS
+            )
+        else:
+            print(f'{await trash_purger.run_once()} trashed todos purged')
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--loop',
+        action='store_true',
+        help='repete a cada TRASH_PURGE_INTERVAL_SECONDS',
+    )
+
+    asyncio.run(main(parser.parse_args()))
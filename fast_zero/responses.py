@@ -0,0 +1,59 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from typing_extensions import TypedDict
+
+
+class TrustedJSONResponse(JSONResponse):
+    """
+    Serializa com o pydantic-core direto para bytes, sem validação.
+
+    Para conteúdo já confiável, como linhas do banco projetadas nas
+    colunas do schema público. A rota devolve a instância e o
+    `response_model` fica apenas para a documentação. Com `serializer`
+    (ver `page_serializer`) os tipos são conhecidos e nada é inferido.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        serializer: TypeAdapter | None = None,
+        **kwargs,
+    ):
+        self.serializer = serializer
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.serializer is None:
+            return to_json(content)
+
+        return self.serializer.dump_json(content)
+
+
+def page_serializer(items_key: str, model: type[BaseModel]) -> TypeAdapter:
+    """
+    Serializador de `{items_key: [dict, ...], 'next_cursor': ...}` em que
+    cada dict tem os campos de `model`. Produz o mesmo JSON do modelo.
+    """
+    row = TypedDict(
+        f'{model.__name__}Row',
+        {name: field.annotation for name, field in model.model_fields.items()},
+    )
+    page = TypedDict(
+        f'{model.__name__}Page',
+        {items_key: list[row], 'next_cursor': str | None},
+    )
+
+    return TypeAdapter(page)
+
+
+def rows_as_dicts(rows) -> list[dict]:
+    """Linhas do SQLAlchemy como dicts; bem mais barato que Row._asdict()."""
+    if not rows:
+        return []
+
+    keys = rows[0]._fields
+
+    return [dict(zip(keys, row, strict=True)) for row in rows]
@@ -1,7 +1,8 @@
 from http import HTTPStatus
+from math import ceil
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -10,32 +11,63 @@ from fast_zero.database import get_session
 from fast_zero.models import User
 from fast_zero.schemas import Token
 from fast_zero.security import (
+    Principal,
+    access_token_claims,
     create_access_token,
     get_current_user,
-    verify_password,
+    login_throttle,
+    verify_and_update_password,
 )
+from fast_zero.throttling import Throttled
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 T_Session = Annotated[Session, Depends(get_session)]
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
-T_User = Annotated[User, Depends(get_current_user)]
+T_User = Annotated[Principal, Depends(get_current_user)]
 
 
 @router.post('/token/', response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2Form,
     session: T_Session,
 ):
+    # Antes de qualquer consulta ou hash: rajadas não ocupam o argon2
+    try:
+        await login_throttle.check(
+            form_data.username, request.client and request.client.host
+        )
+    except Throttled as exc:
+        raise HTTPException(
+            HTTPStatus.TOO_MANY_REQUESTS,
+            detail='Too many login attempts, try again later',
+            headers={'Retry-After': str(ceil(exc.retry_after))},
+        )
+
     user = await session.scalar(
         select(User).where(User.email == form_data.username)
     )
 
-    if not (user and verify_password(form_data.password, user.password)):
+    if not user:
         raise HTTPException(
             HTTPStatus.UNAUTHORIZED, detail='Incorrect email or password'
         )
 
-    access_token = create_access_token({'sub': user.email})
+    valid, new_hash = await verify_and_update_password(
+        form_data.password, user.password
+    )
+
+    if not valid:
+        raise HTTPException(
+            HTTPStatus.UNAUTHORIZED, detail='Incorrect email or password'
+        )
+
+    if new_hash:
+        # Hash com parâmetros antigos do argon2: refeito com os atuais
+        user.password = new_hash
+        await session.commit()
+
+    access_token = create_access_token(access_token_claims(user))
 
     return {'access_token': access_token, 'token_type': 'Bearer'}
 
@@ -44,6 +76,6 @@ async def login_for_access_token(
     '/refresh_token/', status_code=HTTPStatus.OK, response_model=Token
 )
 def refresh_token(user: T_User):
-    token = create_access_token({'sub': user.email})
+    token = create_access_token(access_token_claims(user))
 
     return {'access_token': token, 'token_type': 'Bearer'}
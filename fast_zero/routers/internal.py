@@ -0,0 +1,27 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from fast_zero.database import engine, pool_stats, settings
+from fast_zero.schemas import PoolStats
+
+
+def require_internal_endpoints():
+    # Desligados, respondem como uma rota inexistente
+    if not settings.INTERNAL_ENDPOINTS_ENABLED:
+        raise HTTPException(HTTPStatus.NOT_FOUND, detail='Not Found')
+
+
+# Endpoints operacionais: fora do OpenAPI e desligados por padrão;
+# ligue INTERNAL_ENDPOINTS_ENABLED só onde a rota não é pública
+router = APIRouter(
+    prefix='/internal',
+    tags=['internal'],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_endpoints)],
+)
+
+
+@router.get('/pool', status_code=HTTPStatus.OK, response_model=PoolStats)
+def read_pool_stats():
+    return pool_stats(engine)
@@ -1,26 +1,70 @@
+import csv
+import io
+from collections import Counter
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fast_zero.counters import (
+    apply_deltas,
+    read_counts,
+    removed,
+    state_changes,
+)
 from fast_zero.database import get_session
-from fast_zero.models import Todo, User
+from fast_zero.http_cache import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_etag,
+)
+from fast_zero.models import Todo
+from fast_zero.pagination import next_page, paginate
+from fast_zero.responses import (
+    TrustedJSONResponse,
+    page_serializer,
+    rows_as_dicts,
+)
 from fast_zero.schemas import (
     FilterTodos,
     Message,
+    TodoBulkResult,
+    TodoCriteria,
+    TodoExport,
     TodoList,
     TodoPublic,
     TodoSchema,
+    TodoSelection,
+    TodoStats,
     TodoUpdate,
 )
-from fast_zero.security import get_current_user
+from fast_zero.security import Principal, get_current_user, get_read_session
+from fast_zero.settings import Settings
 
+settings = Settings()
 router = APIRouter(prefix='/todos', tags=['todos'])
 T_Session = Annotated[AsyncSession, Depends(get_session)]
-T_User = Annotated[User, Depends(get_current_user)]
+T_User = Annotated[Principal, Depends(get_current_user)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 T_FilterTodos = Annotated[FilterTodos, Query()]
+T_TodoSelection = Annotated[TodoSelection, Query()]
+T_TodoExport = Annotated[TodoExport, Query()]
+PUBLIC_COLUMNS = [getattr(Todo, field) for field in TodoPublic.model_fields]
+PAGE_SERIALIZER = page_serializer('todos', TodoPublic)
+T_BulkTodos = Annotated[
+    list[TodoSchema], Body(max_length=settings.TODOS_BULK_MAX_ITEMS)
+]
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=TodoPublic)
@@ -33,34 +77,258 @@ async def create_todo(todo: TodoSchema, session: T_Session, user: T_User):
     )
 
     session.add(db_todo)
+    await apply_deltas(session, user.id, Counter([db_todo.state]))
     await session.commit()
-    await session.refresh(db_todo)
 
     return db_todo
 
 
+@router.post('/bulk', status_code=HTTPStatus.CREATED, response_model=TodoList)
+async def create_todos_bulk(
+    todos: T_BulkTodos, session: T_Session, user: T_User
+):
+    rows = [{**todo.model_dump(), 'user_id': user.id} for todo in todos]
+    chunk_size = settings.TODOS_BULK_CHUNK_SIZE
+    created = []
+
+    # Um INSERT ... VALUES (...), (...) RETURNING por lote
+    for start in range(0, len(rows), chunk_size):
+        result = await session.scalars(
+            insert(Todo).returning(Todo, sort_by_parameter_order=True),
+            rows[start : start + chunk_size],
+        )
+        created += result.all()
+
+    await apply_deltas(session, user.id, Counter(todo.state for todo in todos))
+    await session.commit()
+
+    return {'todos': created}
+
+
+def _contains(column, value: str):
+    # LIKE '%valor%' com curingas escapados: atendido pelos índices trigram
+    escaped = (
+        value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    )
+
+    return column.like(f'%{escaped}%', escape='\\')
+
+
+def _todo_criteria(user_id: int, filter: TodoCriteria):
+    criteria = [Todo.user_id == user_id]
+
+    if filter.title:
+        criteria.append(_contains(Todo.title, filter.title))
+
+    if filter.description:
+        criteria.append(_contains(Todo.description, filter.description))
+
+    if filter.state:
+        criteria.append(Todo.state == filter.state)
+
+    return criteria
+
+
 @router.get('/', status_code=HTTPStatus.OK, response_model=TodoList)
 async def list_todo(
+    request: Request,
     filter: T_FilterTodos,
+    session: T_ReadSession,
+    user: T_User,
+):
+    # Só as colunas de TodoPublic, serializadas sem passar pelo modelo.
+    # Montada antes do ETag: um cursor inválido é 422, nunca 304
+    page = paginate(
+        select(*PUBLIC_COLUMNS).where(*_todo_criteria(user.id, filter)),
+        Todo.id,
+        cursor=filter.cursor,
+        offset=filter.offset,
+        limit=filter.limit,
+    )
+
+    # Qualquer escrita altera o count ou o max(updated_at) do usuário
+    count, last_update = (
+        await session.execute(
+            select(func.count(), func.max(Todo.updated_at)).where(
+                Todo.user_id == user.id
+            )
+        )
+    ).one()
+    etag = make_etag(user.id, count, last_update, str(request.query_params))
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    rows = await session.execute(page)
+    rows, next_cursor = next_page(rows.all(), filter.limit, lambda row: row.id)
+
+    response = TrustedJSONResponse(
+        {
+            'todos': rows_as_dicts(rows),
+            'next_cursor': next_cursor,
+        },
+        serializer=PAGE_SERIALIZER,
+    )
+    set_etag(response, etag)
+
+    return response
+
+
+@router.get('/stats', status_code=HTTPStatus.OK, response_model=TodoStats)
+async def todo_stats(session: T_ReadSession, user: T_User):
+    counts = await read_counts(session, user.id)
+
+    return {'counts': counts, 'total': sum(counts.values())}
+
+
+EXPORT_FIELDS = list(TodoPublic.model_fields)
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def _ndjson_chunk(rows):
+    return ''.join(
+        TodoPublic.model_validate(row).model_dump_json() + '\n' for row in rows
+    )
+
+
+def _csv_lines(lines):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(lines)
+
+    return buffer.getvalue()
+
+
+def _csv_chunk(rows):
+    return _csv_lines(
+        TodoPublic.model_validate(row).model_dump(mode='json').values()
+        for row in rows
+    )
+
+
+async def _export_rows(session: AsyncSession, query, format: str):
+    # Quando o corpo começa a ser enviado a dependência já fechou a
+    # sessão: ela é reaberta pelo stream e fechada aqui no final
+    try:
+        if format == 'csv':
+            yield _csv_lines([EXPORT_FIELDS])
+            serialize = _csv_chunk
+        else:
+            serialize = _ndjson_chunk
+
+        result = await session.stream(
+            query.execution_options(yield_per=settings.TODOS_EXPORT_BATCH_SIZE)
+        )
+
+        async for rows in result.mappings().partitions():
+            yield serialize(rows)
+    finally:
+        await session.close()
+
+
+@router.get('/export', status_code=HTTPStatus.OK)
+async def export_todos(
+    export: T_TodoExport,
     session: T_Session,
     user: T_User,
 ):
-    query = select(Todo).where(Todo.user_id == user.id)
+    """
+    Exporta todos os todos do usuário como NDJSON ou CSV, em streaming
+    (cursor no servidor), com memória constante.
+    """
+    query = (
+        select(*PUBLIC_COLUMNS)
+        .where(*_todo_criteria(user.id, export))
+        .order_by(Todo.id)
+    )
 
-    if filter.title:
-        query = query.filter(Todo.title.contains(filter.title))
+    return StreamingResponse(
+        _export_rows(session, query, export.format),
+        media_type=EXPORT_MEDIA_TYPES[export.format],
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="todos.{export.format}"'
+            )
+        },
+    )
 
-    if filter.description:
-        query = query.filter(Todo.description.contains(filter.description))
 
-    if filter.state:
-        query = query.filter(Todo.state == filter.state)
+def _selection_criteria(user_id: int, selection: TodoSelection):
+    if not selection.model_dump(exclude_none=True):
+        raise HTTPException(
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail='At least one selection criterion is required',
+        )
 
-    todos = await session.scalars(
-        query.limit(filter.limit).offset(filter.offset)
+    criteria = _todo_criteria(user_id, selection)
+
+    if selection.ids is not None:
+        criteria.append(Todo.id.in_(selection.ids))
+
+    return criteria
+
+
+@router.patch(
+    '/bulk', status_code=HTTPStatus.OK, response_model=TodoBulkResult
+)
+async def update_todos_bulk(
+    selection: T_TodoSelection,
+    todo: TodoUpdate,
+    session: T_Session,
+    user: T_User,
+):
+    changes = todo.model_dump(exclude_unset=True)
+
+    if not changes:
+        raise HTTPException(
+            HTTPStatus.UNPROCESSABLE_ENTITY, detail='No fields to update'
+        )
+
+    # O CTE trava as linhas e devolve o estado anterior para os contadores
+    old = (
+        select(Todo.id, Todo.state)
+        .where(*_selection_criteria(user.id, selection))
+        .with_for_update()
+        .cte('old')
+    )
+    result = await session.execute(
+        update(Todo)
+        .where(Todo.id == old.c.id)
+        .values(**changes)
+        .returning(Todo.id, old.c.state)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    await apply_deltas(
+        session,
+        user.id,
+        state_changes((state for _, state in rows), changes.get('state')),
+    )
+    await session.commit()
+    ids = sorted(id for id, _ in rows)
+
+    return {'affected': len(ids), 'ids': ids}
+
+
+@router.delete(
+    '/bulk', status_code=HTTPStatus.OK, response_model=TodoBulkResult
+)
+async def delete_todos_bulk(
+    selection: T_TodoSelection,
+    session: T_Session,
+    user: T_User,
+):
+    result = await session.execute(
+        delete(Todo)
+        .where(*_selection_criteria(user.id, selection))
+        .returning(Todo.id, Todo.state)
+        .execution_options(synchronize_session=False)
     )
+    rows = result.all()
+    await apply_deltas(session, user.id, removed(state for _, state in rows))
+    await session.commit()
+    ids = sorted(id for id, _ in rows)
 
-    return {'todos': todos.all()}
+    return {'affected': len(ids), 'ids': ids}
 
 
 @router.delete(
@@ -71,14 +339,18 @@ async def delete_todo(
     user: T_User,
     session: T_Session,
 ):
-    todo = await session.scalar(
-        select(Todo).where(Todo.user_id == user.id, Todo.id == id)
+    state = await session.scalar(
+        delete(Todo)
+        .where(Todo.user_id == user.id, Todo.id == id)
+        .returning(Todo.state)
+        .execution_options(synchronize_session=False)
     )
 
-    if not todo:
+    if not state:
         raise HTTPException(HTTPStatus.NOT_FOUND, detail='Task not Found')
 
-    await session.delete(todo)
+    await apply_deltas(session, user.id, removed([state]))
+    await session.commit()
 
     return Message(message='Task has been deleted sucessfully')
 
@@ -87,18 +359,24 @@ async def delete_todo(
 async def update_tudo(
     id: int, session: T_Session, user: T_User, todo: TodoUpdate
 ):
+    # Trava a linha: o estado lido é a base do delta dos contadores
     db_todo = await session.scalar(
-        select(Todo).where(Todo.user_id == user.id, Todo.id == id)
+        select(Todo)
+        .where(Todo.user_id == user.id, Todo.id == id)
+        .with_for_update()
     )
 
     if not db_todo:
         raise HTTPException(HTTPStatus.NOT_FOUND, detail='Task not Found')
 
-    for key, value in todo.model_dump(exclude_unset=True).items():
+    changes = todo.model_dump(exclude_unset=True)
+    deltas = state_changes([db_todo.state], changes.get('state'))
+
+    for key, value in changes.items():
         setattr(db_todo, key, value)
 
     session.add(db_todo)
+    await apply_deltas(session, user.id, deltas)
     await session.commit()
-    await session.refresh(db_todo)
 
     return db_todo
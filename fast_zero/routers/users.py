@@ -1,62 +1,114 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import exists, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fast_zero.database import get_session
+from fast_zero.http_cache import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_etag,
+)
 from fast_zero.models import User
+from fast_zero.pagination import next_page, paginate
+from fast_zero.responses import (
+    TrustedJSONResponse,
+    page_serializer,
+    rows_as_dicts,
+)
 from fast_zero.schemas import UserList, UserPublic, UserSchema
 from fast_zero.security import (
+    Principal,
     get_current_user,
     get_password_hash,
+    get_read_session,
+    invalidate_principal,
 )
 
 router = APIRouter(prefix='/users', tags=['users'])
 T_Session = Annotated[AsyncSession, Depends(get_session)]
-T_User = Annotated[User, Depends(get_current_user)]
+T_User = Annotated[Principal, Depends(get_current_user)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+PUBLIC_COLUMNS = [getattr(User, field) for field in UserPublic.model_fields]
+PAGE_SERIALIZER = page_serializer('users', UserPublic)
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=UserPublic)
 async def create_user(user: UserSchema, session: T_Session):
-    db_user = await session.scalar(
-        select(User).where(
-            (User.username == user.username) | (User.email == user.email)
-        )
+    conflict = HTTPException(
+        status_code=HTTPStatus.CONFLICT,
+        detail='Email Or Username Already Exist',
     )
 
-    if db_user:
-        raise HTTPException(
-            status_code=HTTPStatus.CONFLICT,
-            detail='Email Or Username Already Exist',
+    # Duplicatas óbvias não ocupam o pool do argon2
+    taken = await session.scalar(
+        select(
+            exists().where(
+                (User.email == user.email) | (User.username == user.username)
+            )
         )
+    )
+
+    if taken:
+        raise conflict
+
+    password = await get_password_hash(user.password)
+
+    # O ON CONFLICT decide a corrida entre cadastros simultâneos
+    db_user = await session.scalar(
+        insert(User)
+        .values(username=user.username, email=user.email, password=password)
+        .on_conflict_do_nothing()
+        .returning(User)
+    )
+
+    if not db_user:
+        raise conflict
 
-    db_user = User(user.username, user.email, get_password_hash(user.password))
-    session.add(db_user)
     await session.commit()
-    await session.refresh(db_user)
 
     return db_user
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
 async def list_users(
-    session: T_Session,
+    session: T_ReadSession,
     current_user: T_User,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ):
-    users = await session.scalars(select(User).offset(skip).limit(limit))
-    users = users.all()
-
-    return {'users': users}
+    # Só as colunas de UserPublic, serializadas sem passar pelo modelo
+    rows = await session.execute(
+        paginate(
+            select(*PUBLIC_COLUMNS),
+            User.id,
+            cursor=cursor,
+            offset=skip,
+            limit=limit,
+        )
+    )
+    rows, next_cursor = next_page(rows.all(), limit, lambda row: row.id)
+
+    return TrustedJSONResponse(
+        {
+            'users': rows_as_dicts(rows),
+            'next_cursor': next_cursor,
+        },
+        serializer=PAGE_SERIALIZER,
+    )
 
 
 @router.get('/{id}', status_code=HTTPStatus.OK, response_model=UserPublic)
 async def get_user(
+    request: Request,
+    response: Response,
     id: int,
-    session: T_Session,
+    session: T_ReadSession,
     current_user: T_User,
 ):
     user = await session.scalar(select(User).where(User.id == id))
@@ -64,6 +116,13 @@ async def get_user(
     if not user:
         raise HTTPException(HTTPStatus.NOT_FOUND, 'User Not Found')
 
+    etag = make_etag(user.id, user.updated_at)
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+
     return user
 
 
@@ -91,14 +150,18 @@ async def update_user(
             HTTPStatus.CONFLICT, 'Email Or Username Already Exist'
         )
 
-    curr_user.username = user.username
-    curr_user.email = user.email
-    curr_user.password = get_password_hash(user.password)
+    db_user = await session.get(User, curr_user.id)
+
+    db_user.username = user.username
+    db_user.email = user.email
+    db_user.password = await get_password_hash(user.password)
+    # Revoga os tokens emitidos: a senha foi trocada e as claims mudaram
+    db_user.token_version += 1
 
     await session.commit()
-    await session.refresh(curr_user)
+    invalidate_principal(curr_user.email, curr_user.id)
 
-    return curr_user
+    return db_user
 
 
 @router.delete('/{id}', status_code=HTTPStatus.OK, response_model=UserPublic)
@@ -113,7 +176,11 @@ async def delete_user(
             detail='Not enough permissions',
         )
 
-    await session.delete(curr_user)
+    # Os todos (e contadores) saem pelo ON DELETE CASCADE, sem carregá-los
+    db_user = await session.get(User, curr_user.id)
+
+    await session.delete(db_user)
     await session.commit()
+    invalidate_principal(curr_user.email, curr_user.id)
 
-    return curr_user
+    return db_user
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 from fast_zero.models import TodoState
 
@@ -25,6 +26,7 @@ class UserPublic(BaseModel):
 
 class UserList(BaseModel):
     users: list[UserPublic]
+    next_cursor: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -46,12 +48,24 @@ class TodoPublic(TodoSchema):
     updated_at: datetime
 
 
-class FilterTodos(BaseModel):
+class TodoCriteria(BaseModel):
     title: str | None = Field(default=None, min_length=3, max_length=15)
     description: str | None = Field(default=None, min_length=3, max_length=15)
     state: TodoState | None = None
+
+
+class FilterTodos(TodoCriteria):
     offset: int = 0
     limit: int = 100
+    cursor: str | None = None
+
+
+class TodoExport(TodoCriteria):
+    format: Literal['ndjson', 'csv'] = 'ndjson'
+
+
+class TodoSelection(TodoCriteria):
+    ids: list[int] | None = None
 
 
 class TodoUpdate(BaseModel):
@@ -59,6 +73,41 @@ class TodoUpdate(BaseModel):
     description: str | None = None
     state: TodoState | None = None
 
+    @field_validator('title', 'description', 'state')
+    @classmethod
+    def not_null(cls, value):
+        # Campos podem ser omitidos, mas não nulos: as colunas são NOT NULL
+        if value is None:
+            raise ValueError('must not be null')
+
+        return value
+
 
 class TodoList(BaseModel):
     todos: list[TodoPublic]
+    next_cursor: str | None = None
+
+
+class TodoStats(BaseModel):
+    counts: dict[TodoState, int]
+    total: int
+
+
+class TodoBulkResult(BaseModel):
+    affected: int
+    ids: list[int]
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    timeouts: int
+    wait_seconds: HistogramSnapshot
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from http import HTTPStatus
 from typing import Annotated
@@ -6,30 +7,104 @@ from zoneinfo import ZoneInfo
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode, encode
-from pwdlib import PasswordHash
 from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fast_zero.database import get_session
+from fast_zero.cache import TTLCache
+from fast_zero.database import get_session, read_router
+from fast_zero.hashing import (
+    Argon2Params,
+    HashingExecutor,
+    HashingPoolSaturated,
+    check_and_update_password,
+    check_password,
+    hash_password,
+)
 from fast_zero.models import User
 from fast_zero.settings import Settings
+from fast_zero.throttling import LoginThrottle, MemoryBackend, Rate
 
-pwd_context = PasswordHash.recommended()
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl='/auth/token', refreshUrl='/auth/refresh_token'
 )
 settings = Settings()
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+# user_id -> token_version atual, para conferir a claim `ver`
+token_version_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
+hashing_executor = HashingExecutor(
+    kind=settings.HASHING_EXECUTOR,
+    max_workers=settings.HASHING_MAX_WORKERS,
+    max_pending=settings.HASHING_MAX_PENDING,
+)
+login_throttle = LoginThrottle(
+    MemoryBackend(maxsize=settings.LOGIN_THROTTLE_MAX_KEYS),
+    account_rate=Rate(
+        settings.LOGIN_ACCOUNT_BURST, settings.LOGIN_ACCOUNT_PER_MINUTE / 60
+    ),
+    ip_rate=Rate(settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE / 60),
+    enabled=settings.LOGIN_THROTTLE_ENABLED,
+)
+argon2_params = Argon2Params(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Projeção mínima do usuário autenticado.
+
+    Rotas que precisam da linha completa (ou dos todos) devem carregá-la.
+    """
+
+    id: int
+    email: str
+    username: str
+    token_version: int = 0
+
 
 T_AsyncSession = Annotated[AsyncSession, Depends(get_session)]
 Tr_oauth2_scheme = Annotated[str, Depends(oauth2_scheme)]
 
 
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
+async def _run_hashing(func, *args):
+    try:
+        return await hashing_executor.run(func, *args)
+    except HashingPoolSaturated:
+        raise HTTPException(
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            detail='Server busy, try again later',
+            headers={'Retry-After': '1'},
+        )
+
+
+async def get_password_hash(password: str):
+    return await _run_hashing(hash_password, password, argon2_params)
 
 
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str):
+    return await _run_hashing(check_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+):
+    """Como verify_password, mais o novo hash se os parâmetros mudaram."""
+    return await _run_hashing(
+        check_and_update_password,
+        plain_password,
+        hashed_password,
+        argon2_params,
+    )
 
 
 def create_access_token(data: dict):
@@ -48,6 +123,50 @@ def create_access_token(data: dict):
     return encode_jwt
 
 
+def access_token_claims(user: User | Principal):
+    """Claims que permitem autenticar sem ler a linha do usuário."""
+    return {
+        'sub': user.email,
+        'uid': user.id,
+        'username': user.username,
+        'ver': user.token_version,
+    }
+
+
+async def _current_token_version(session: AsyncSession, user_id: int):
+    version = token_version_cache.get(user_id)
+
+    if version is None:
+        version = await session.scalar(
+            select(User.token_version).where(User.id == user_id)
+        )
+
+        if version is not None:
+            token_version_cache.set(user_id, version)
+
+    return version
+
+
+def _principal_from_claims(payload: dict):
+    user_id = payload.get('uid')
+    username = payload.get('username')
+    version = payload.get('ver')
+
+    if not (
+        isinstance(user_id, int)
+        and isinstance(username, str)
+        and isinstance(version, int)
+    ):
+        return None
+
+    return Principal(
+        id=user_id,
+        email=payload['sub'],
+        username=username,
+        token_version=version,
+    )
+
+
 async def get_current_user(
     session: T_AsyncSession,
     token: Tr_oauth2_scheme,
@@ -70,13 +189,88 @@ async def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exceptions
 
-    user = await session.scalar(
-        select(User).where(User.email == subject_email)
-    )
+    if 'uid' in payload:
+        # Token com claims: basta conferir a versão (em cache)
+        principal = _principal_from_claims(payload)
+
+        if not principal or principal.token_version != (
+            await _current_token_version(session, principal.id)
+        ):
+            raise credentials_exceptions
+
+        session.info['principal_id'] = principal.id
+        return principal
 
-    if not user:
+    # Tokens antigos, só com `sub`: usuário buscado pelo email. Valem
+    # como versão 0, então qualquer revogação também os invalida
+    principal = principal_cache.get(subject_email)
+
+    if principal:
+        if await _current_token_version(session, principal.id) != 0:
+            raise credentials_exceptions
+
+        session.info['principal_id'] = principal.id
+        return principal
+
+    row = (
+        await session.execute(
+            select(
+                User.id, User.email, User.username, User.token_version
+            ).where(User.email == subject_email)
+        )
+    ).first()
+
+    if not row:
         # possivel falha de segurança
         # (token criado de forma indireta ou incorreta)
         raise credentials_exceptions
 
-    return user
+    token_version_cache.set(row.id, row.token_version)
+
+    if row.token_version != 0:
+        raise credentials_exceptions
+
+    principal = Principal(
+        id=row.id,
+        email=row.email,
+        username=row.username,
+        token_version=row.token_version,
+    )
+    principal_cache.set(subject_email, principal)
+    session.info['principal_id'] = principal.id
+
+    return principal
+
+
+T_Principal = Annotated[Principal, Depends(get_current_user)]
+
+
+async def get_read_session(session: T_AsyncSession, user: T_Principal):
+    """
+    Sessão para rotas somente leitura: usa uma réplica quando houver.
+
+    Cai para o primário se nenhuma réplica conectar ou se o usuário
+    escreveu recentemente. Falhas depois de conectar não são refeitas.
+    """
+    for replica in read_router.candidates(user.id):
+        read_session = AsyncSession(replica, expire_on_commit=False)
+        try:
+            await read_session.connection()
+        except DBAPIError:
+            await read_session.close()
+            read_router.mark_down(replica)
+            continue
+
+        try:
+            yield read_session
+        finally:
+            await read_session.close()
+
+        return
+
+    yield session
+
+
+def invalidate_principal(subject_email: str, user_id: int):
+    principal_cache.invalidate(subject_email)
+    token_version_cache.invalidate(user_id)
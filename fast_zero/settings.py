@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import PositiveFloat, PositiveInt
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,3 +13,66 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_PREPARE_THRESHOLD: int | None = 5
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    # /internal/* (estatísticas do pool): só em redes internas
+    INTERNAL_ENDPOINTS_ENABLED: bool = False
+
+    # Lista JSON, ex.: '["postgresql+psycopg://app@replica1/app"]'
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_RETRY_SECONDS: float = 30
+    READ_YOUR_WRITES_SECONDS: float = 5
+
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    # Atraso máximo para um token revogado deixar de valer noutro worker
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 30
+
+    HASHING_EXECUTOR: Literal['process', 'thread'] = 'process'
+    HASHING_MAX_WORKERS: int | None = None
+    HASHING_MAX_PENDING: int = 64
+
+    # Mudanças valem para novos hashes; os antigos são refeitos no login
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    # Tentativas de login: rajada e reposição por minuto, por conta e IP
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_MAX_KEYS: int = 100_000
+    LOGIN_ACCOUNT_BURST: PositiveInt = 5
+    LOGIN_ACCOUNT_PER_MINUTE: PositiveFloat = 5
+    LOGIN_IP_BURST: PositiveInt = 20
+    LOGIN_IP_PER_MINUTE: PositiveFloat = 30
+
+    TODOS_BULK_MAX_ITEMS: int = 1000
+    TODOS_BULK_CHUNK_SIZE: int = 500
+
+    TODOS_EXPORT_BATCH_SIZE: int = 1000
+
+    # Expurgo da lixeira; no lifespan só com TRASH_PURGE_ENABLED
+    TRASH_PURGE_ENABLED: bool = False
+    TRASH_RETENTION_DAYS: float = 30
+    TRASH_PURGE_BATCH_SIZE: int = 500
+    TRASH_PURGE_PAUSE_SECONDS: float = 0.1
+    TRASH_PURGE_INTERVAL_SECONDS: float = 3600
+
+    # Respostas de corpo único menores que isso não são comprimidas
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_MEDIA_TYPES: list[str] = [
+        'application/json',
+        'application/x-ndjson',
+        'text/csv',
+    ]
+
+    HTML_MAX_AGE_SECONDS: int = 300
+    # Relê root.html quando o arquivo muda; só para desenvolvimento
+    HTML_RELOAD: bool = False
@@ -0,0 +1,91 @@
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class StatementStats:
+    """Statements executados e tempo de banco acumulados num request."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current_stats: ContextVar[StatementStats | None] = ContextVar(
+    'statement_stats', default=None
+)
+
+
+def current_stats() -> StatementStats | None:
+    return _current_stats.get()
+
+
+def instrument_engine(engine: AsyncEngine, slow_threshold_ms: float):
+    """
+    Liga os eventos de cursor da engine às estatísticas do request.
+
+    Statements acima de `slow_threshold_ms` vão para o log como WARNING.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def _before(conn, *args):
+        conn.info.setdefault('statement_start', []).append(perf_counter())
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, *args):
+        elapsed = perf_counter() - conn.info['statement_start'].pop()
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+
+        if elapsed * 1000 >= slow_threshold_ms:
+            logger.warning(
+                'Slow query (%.1f ms): %s', elapsed * 1000, statement
+            )
+
+
+class StatementStatsMiddleware:
+    """
+    Abre um StatementStats por request e o publica em `request.state.sql`.
+
+    O total chega ao cliente no header `Server-Timing`; statements de
+    respostas em streaming, executados depois dos headers, não entram.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = StatementStats()
+        scope.setdefault('state', {})['sql'] = stats
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                timing = (
+                    f'db;dur={stats.seconds * 1000:.1f};'
+                    f'desc="{stats.count} statements"'
+                )
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (b'server-timing', timing.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
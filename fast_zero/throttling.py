@@ -0,0 +1,128 @@
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Protocol
+
+
+@dataclass(frozen=True, slots=True)
+class Rate:
+    """Balde de `burst` fichas, reabastecido a `per_second` fichas/s."""
+
+    burst: int
+    per_second: float
+
+    def __post_init__(self):
+        # Sem reposição o balde nunca recupera (e retry_after divide por 0)
+        if self.per_second <= 0:
+            raise ValueError('per_second must be positive')
+
+
+class ThrottleBackend(Protocol):
+    """
+    Armazenamento dos baldes.
+
+    `take` consome uma ficha de `key` e retorna 0 se havia ficha, ou os
+    segundos até a próxima. Um backend compartilhado (ex.: Redis) deve
+    fazer isso atomicamente.
+    """
+
+    async def take(self, key: str, rate: Rate) -> float: ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Baldes em memória, O(1) por verificação.
+
+    Limitado a `maxsize` chaves: as menos recentes são descartadas (e
+    recomeçam cheias). Cada worker mantém os seus.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: Rate) -> float:
+        now = monotonic()
+        tokens, updated_at = self._buckets.pop(key, (rate.burst, now))
+        tokens = min(rate.burst, tokens + (now - updated_at) * rate.per_second)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / rate.per_second
+
+        self._buckets[key] = (tokens, now)
+
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+    async def clear(self):
+        self._buckets.clear()
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class Throttled(Exception):
+    def __init__(self, scope: str, retry_after: float):
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class LoginThrottle:
+    """
+    Limita tentativas de login por IP e por conta, antes do argon2.
+
+    O IP é verificado primeiro: uma rajada contra várias contas não gasta
+    as fichas das contas.
+    """
+
+    def __init__(
+        self,
+        backend: ThrottleBackend,
+        account_rate: Rate,
+        ip_rate: Rate,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.account_rate = account_rate
+        self.ip_rate = ip_rate
+        self.enabled = enabled
+        self.rejected: Counter[str] = Counter()
+
+    async def check(self, account: str, ip: str | None):
+        if not self.enabled:
+            return
+
+        checks = [('account', f'account:{account.lower()}', self.account_rate)]
+        if ip:
+            checks.insert(0, ('ip', f'ip:{ip}', self.ip_rate))
+
+        for scope, key, rate in checks:
+            retry_after = await self.backend.take(key, rate)
+
+            if retry_after:
+                self.rejected[scope] += 1
+                raise Throttled(scope, retry_after)
+
+    def render(self) -> str:
+        lines = [
+            '# HELP login_throttled_total Login attempts rejected by scope.',
+            '# TYPE login_throttled_total counter',
+        ]
+        for scope in ('account', 'ip'):
+            lines.append(
+                f'login_throttled_total{{scope="{scope}"}} '
+                f'{self.rejected[scope]}'
+            )
+
+        return '\n'.join(lines) + '\n'
+
+    async def clear(self):
+        await self.backend.clear()
+        self.rejected.clear()
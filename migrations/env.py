@@ -24,6 +24,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = table_registry.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Trigram indexes are created only by migration 8883b3c3cec3
+    # (they need pg_trgm), so autogenerate must not try to drop them.
+    if type_ == 'index' and reflected and name.endswith('_trgm'):
+        return False
+
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +58,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -56,7 +67,9 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection):
     context.configure(
-        connection=connection, target_metadata=target_metadata
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,86 @@
+"""add todos trigram indexes
+
+Revision ID: 8883b3c3cec3
+Revises: f5cf4e23c1fa
+Create Date: 2026-10-18 11:37:52.118724
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8883b3c3cec3'
+down_revision: Union[str, Sequence[str], None] = 'f5cf4e23c1fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# Not declared in the models: they depend on the pg_trgm extension,
+# see include_object in migrations/env.py.
+TRGM_INDEXES = {
+    'ix_todos_title_trgm': 'title',
+    'ix_todos_description_trgm': 'description',
+}
+
+
+def _enable_pg_trgm(bind) -> bool:
+    if bind.dialect.name != 'postgresql':
+        return False
+
+    if op.get_context().as_sql:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        return True
+
+    available = bind.scalar(sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    ))
+
+    if not available:
+        return False
+
+    try:
+        with bind.begin_nested():
+            bind.execute(sa.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    except sa.exc.DBAPIError:
+        # e.g. the role is not allowed to create extensions
+        return False
+
+    return True
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _enable_pg_trgm(op.get_bind()):
+        logger.warning(
+            'pg_trgm is unavailable: todo title/description filters '
+            'will fall back to sequential scans'
+        )
+        return
+
+    # CONCURRENTLY avoids blocking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, column in TRGM_INDEXES.items():
+            op.create_index(
+                name,
+                'todos',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name in TRGM_INDEXES:
+        op.drop_index(name, table_name='todos', if_exists=True)
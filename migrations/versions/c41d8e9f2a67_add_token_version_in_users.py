@@ -0,0 +1,28 @@
+"""add token_version in users
+
+Revision ID: c41d8e9f2a67
+Revises: b7e2f04a9c31
+Create Date: 2026-10-18 20:45:12.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e9f2a67'
+down_revision: Union[str, Sequence[str], None] = 'b7e2f04a9c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,28 @@
+"""add todos trash partial index
+
+Revision ID: d83a5c0e7f14
+Revises: c41d8e9f2a67
+Create Date: 2026-10-18 21:10:37.402915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83a5c0e7f14'
+down_revision: Union[str, Sequence[str], None] = 'c41d8e9f2a67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_todos_trash_id', 'todos', ['id'], unique=False, postgresql_where=sa.text("state = 'trash'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_trash_id', table_name='todos', postgresql_where=sa.text("state = 'trash'"))
@@ -0,0 +1,30 @@
+"""cascade todos on user delete
+
+Revision ID: e5b19a7c3d42
+Revises: d83a5c0e7f14
+Create Date: 2026-10-18 22:05:48.551307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19a7c3d42'
+down_revision: Union[str, Sequence[str], None] = 'd83a5c0e7f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('todos_user_id_fkey', 'todos', type_='foreignkey')
+    op.create_foreign_key('todos_user_id_fkey', 'todos', 'users', ['user_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('todos_user_id_fkey', 'todos', type_='foreignkey')
+    op.create_foreign_key('todos_user_id_fkey', 'todos', 'users', ['user_id'], ['id'])
@@ -13,7 +13,13 @@ from testcontainers.postgres import PostgresContainer
 from fast_zero.app import app
 from fast_zero.database import get_session
 from fast_zero.models import User, table_registry
+from fast_zero.security import (
+    login_throttle,
+    principal_cache,
+    token_version_cache,
+)
 from fast_zero.settings import Settings
+from fast_zero.statements import instrument_engine
 
 
 @pytest.fixture
@@ -21,6 +27,22 @@ def settings():
     return Settings()
 
 
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    token_version_cache.clear()
+    yield
+    principal_cache.clear()
+    token_version_cache.clear()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_login_throttle():
+    await login_throttle.clear()
+    yield
+    await login_throttle.clear()
+
+
 @pytest.fixture
 def client(session: AsyncSession):
     def get_session_override():
@@ -89,6 +111,7 @@ def tokens(users, settings):
 def engine():
     with PostgresContainer('postgres:latest', driver='psycopg') as postgres:
         _engine = create_async_engine(postgres.get_connection_url())
+        instrument_engine(_engine, Settings().SLOW_QUERY_THRESHOLD_MS)
         yield _engine
 
 
@@ -128,3 +151,47 @@ def _mock_db_time(*, model, time=datetime.now()):
 @pytest.fixture
 def mock_db_time():
     return _mock_db_time
+
+
+@contextmanager
+def _count_statements(engine):
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+    yield statements
+
+    event.remove(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+
+@pytest.fixture
+def count_statements(engine):
+    return lambda: _count_statements(engine)
+
+
+@contextmanager
+def _max_statements(engine, limit):
+    with _count_statements(engine) as statements:
+        yield statements
+
+    assert len(statements) <= limit, (
+        f'{len(statements)} statements executed, expected at most {limit}:\n'
+        + '\n'.join(statements)
+    )
+
+
+@pytest.fixture
+def max_statements(engine):
+    """
+    Falha o teste se o bloco executar mais que `limit` statements.
+
+    Uso: `with max_statements(2): client.get('/todos/')`
+    """
+    return lambda limit: _max_statements(engine, limit)
@@ -1,5 +1,13 @@
+import os
 from http import HTTPStatus
 
+import brotli
+import pytest
+
+from fast_zero.app import root_page
+from fast_zero.http_cache import negotiate_encoding
+from fast_zero.pages import StaticPage
+
 
 def test_root_retorna_ola_mundo(client):
     # Execute
@@ -18,3 +26,67 @@ def test_root_html_retorna_html(client):
     expected = open('fast_zero/root.html', 'r', encoding='utf-8')
     assert response.text == expected.read()
     assert response.status_code == HTTPStatus.OK
+
+
+def test_root_html_not_modified(client):
+    etag = client.get('/html').headers['etag']
+
+    response = client.get('/html', headers={'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['cache-control'].startswith('public, max-age=')
+
+
+def test_root_html_gzip_variant(client):
+    response = client.get('/html', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.text == root_page.body.decode()
+
+
+def test_root_html_brotli_variant(client):
+    with client.stream(
+        'GET', '/html', headers={'Accept-Encoding': 'gzip, br'}
+    ) as response:
+        raw = b''.join(response.iter_raw())
+
+    assert response.headers['content-encoding'] == 'br'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert raw == root_page.variants['br']
+    assert brotli.decompress(raw) == root_page.body
+
+
+def test_root_html_identity(client):
+    response = client.get('/html', headers={'Accept-Encoding': 'identity'})
+
+    assert 'content-encoding' not in response.headers
+    assert response.content == root_page.body
+
+
+def test_static_page_reloads_when_file_changes(tmp_path):
+    page_path = tmp_path / 'page.html'
+    page_path.write_text('<p>old</p>', encoding='utf-8')
+    page = StaticPage(page_path, max_age=0, reload=True)
+    old_etag = page.etag
+
+    page_path.write_text('<p>new</p>', encoding='utf-8')
+    os.utime(page_path, ns=(0, page.path.stat().st_mtime_ns + 1))
+    page._reload_if_changed()
+
+    assert page.body == b'<p>new</p>'
+    assert page.etag != old_etag
+
+
+@pytest.mark.parametrize(
+    ('header', 'expected'),
+    [
+        ('gzip, br', 'br'),
+        ('gzip;q=1.0, br;q=0.5', 'gzip'),
+        ('br;q=0, *', 'gzip'),
+        ('identity', None),
+        ('', None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, ['br', 'gzip']) == expected
@@ -1,7 +1,14 @@
 from http import HTTPStatus
 
+import pytest
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
+from sqlalchemy import select
+
+from fast_zero import security
+from fast_zero.hashing import Argon2Params
+from fast_zero.models import User
+from fast_zero.security import hashing_executor
 
 
 def test_get_token(client: TestClient, users):
@@ -116,3 +123,79 @@ def test_token_expired_dont_refresh(client: TestClient, users):
 
         assert response.status_code == HTTPStatus.UNAUTHORIZED
         assert data['detail'] == 'Could not validate credentials'
+
+
+def test_get_token_when_hashing_pool_is_saturated(
+    client: TestClient, users, monkeypatch
+):
+    monkeypatch.setattr(hashing_executor, 'max_pending', 0)
+
+    response = client.post(
+        '/auth/token/',
+        data={
+            'username': users[0]['email'],
+            'password': users[0]['clean_password'],
+        },
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+    assert response.json()['detail'] == 'Server busy, try again later'
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password(
+    client: TestClient, session, users, monkeypatch
+):
+    monkeypatch.setattr(
+        security,
+        'argon2_params',
+        Argon2Params(time_cost=1, memory_cost=8192, parallelism=1),
+    )
+
+    response = client.post(
+        '/auth/token/',
+        data={'username': users[0]['email'], 'password': 'secret'},
+    )
+    password = await session.scalar(
+        select(User.password).where(User.id == users[0]['id'])
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert password.startswith('$argon2id$v=19$m=8192,t=1,p=1$')
+
+
+@pytest.mark.asyncio
+async def test_login_keeps_current_password_hash(
+    client: TestClient, session, users
+):
+    response = client.post(
+        '/auth/token/',
+        data={'username': users[0]['email'], 'password': 'secret'},
+    )
+    password = await session.scalar(
+        select(User.password).where(User.id == users[0]['id'])
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert password == users[0]['password']
+
+
+def test_get_token_throttled_before_hashing(
+    client: TestClient, users, monkeypatch
+):
+    async def fail(*args):
+        raise AssertionError('argon2 should not run')
+
+    form = {'username': users[0]['email'], 'password': 'NotSecret'}
+    for _ in range(security.login_throttle.account_rate.burst):
+        client.post('/auth/token/', data=form)
+
+    monkeypatch.setattr(security.hashing_executor, 'run', fail)
+    response = client.post('/auth/token/', data=form)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response.headers['retry-after']) > 0
+    assert 'login_throttled_total{scope="account"} 1' in (
+        client.get('/metrics').text
+    )
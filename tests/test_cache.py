@@ -0,0 +1,63 @@
+from freezegun import freeze_time
+
+from fast_zero.cache import TTLCache, render_caches
+
+
+def test_cache_hit_and_miss():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    assert cache.get('a') is None
+
+    cache.set('a', 1)
+
+    assert cache.get('a') == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 'A')
+    cache.set('b', 'B')
+    cache.get('a')
+    cache.set('c', 'C')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A'
+    assert cache.get('c') == 'C'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_entry_expires_after_ttl():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    with freeze_time('2000-01-01 00:00:00'):
+        cache.set('a', 1)
+
+    with freeze_time('2000-01-01 00:01:01'):
+        assert cache.get('a') is None
+
+    assert len(cache) == 0
+
+
+def test_cache_invalidate():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+    cache.invalidate('a')
+    cache.invalidate('not-cached')
+
+    assert cache.get('a') is None
+
+
+def test_render_caches_groups_families():
+    first, second = TTLCache(maxsize=2, ttl=60), TTLCache(maxsize=2, ttl=60)
+    first.set('a', 1)
+    first.get('a')
+
+    text = render_caches({'second': second, 'first': first})
+
+    assert text.count('# TYPE cache_hits_total counter') == 1
+    assert 'cache_hits_total{cache="first"} 1' in text
+    assert 'cache_size{cache="second"} 0' in text
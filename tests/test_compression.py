@@ -0,0 +1,126 @@
+import zlib
+from http import HTTPStatus
+
+import pytest
+import zstandard
+
+from fast_zero.compression import CompressionMiddleware, compressors
+from fast_zero.models import Todo
+
+
+async def _run(app, accept_encoding=b'gzip'):
+    messages = []
+
+    async def receive():  # pragma: no cover
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/',
+        'headers': [(b'accept-encoding', accept_encoding)],
+    }
+    await CompressionMiddleware(app, minimum_size=10)(scope, receive, send)
+
+    return messages
+
+
+def _app(chunks, content_type=b'application/json'):
+    async def app(scope, receive, send):
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', content_type)],
+        })
+        for index, chunk in enumerate(chunks):
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': index < len(chunks) - 1,
+            })
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_are_decodable_as_they_arrive():
+    chunks = [b'{"a": 1}\n' * 20, b'{"b": 2}\n' * 20, b'']
+    start, *bodies = await _run(_app(chunks))
+    headers = dict(start['headers'])
+    decompressor = zlib.decompressobj(31)
+
+    assert headers[b'content-encoding'] == b'gzip'
+    assert b'content-length' not in headers
+    assert decompressor.decompress(bodies[0]['body']) == chunks[0]
+    assert decompressor.decompress(bodies[1]['body']) == chunks[1]
+    assert not bodies[-1]['more_body']
+
+
+@pytest.mark.asyncio
+async def test_zstd_streamed_chunks_are_decodable_as_they_arrive():
+    chunks = [b'{"a": 1}\n' * 20, b'{"b": 2}\n' * 20, b'']
+    _, *bodies = await _run(_app(chunks), b'zstd')
+    decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    assert decompressor.decompress(bodies[0]['body']) == chunks[0]
+    assert decompressor.decompress(bodies[1]['body']) == chunks[1]
+
+
+@pytest.mark.asyncio
+async def test_small_and_unlisted_responses_pass_through():
+    start, body = await _run(_app([b'{}']))
+
+    assert b'content-encoding' not in dict(start['headers'])
+    assert body['body'] == b'{}'
+
+    start, body = await _run(_app([b'x' * 100], content_type=b'image/png'))
+
+    assert b'content-encoding' not in dict(start['headers'])
+
+
+@pytest.mark.asyncio
+async def test_no_accepted_encoding_passes_through():
+    start, body = await _run(_app([b'x' * 100]), accept_encoding=b'br')
+
+    assert b'content-encoding' not in dict(start['headers'])
+    assert body['body'] == b'x' * 100
+
+
+@pytest.mark.asyncio
+async def test_zstd_is_preferred():
+    start, body = await _run(_app([b'x' * 100]), b'gzip, zstd')
+    # Frame em streaming: sem o tamanho no cabeçalho, como num cliente
+    decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    assert dict(start['headers'])[b'content-encoding'] == b'zstd'
+    assert decompressor.decompress(body['body']) == b'x' * 100
+
+
+def test_compressors_prefer_zstd_over_gzip():
+    assert list(compressors()) == ['zstd', 'gzip']
+
+
+@pytest.mark.asyncio
+async def test_list_todos_is_compressed(client, session, users, tokens):
+    total = 20
+    session.add_all([
+        Todo(f'todo {n}', 'long description ' * 20, 'todo', users[0]['id'])
+        for n in range(total)
+    ])
+    await session.commit()
+
+    response = client.get(
+        '/todos/',
+        headers={
+            'Authorization': f'Bearer {tokens[0]}',
+            'Accept-Encoding': 'gzip',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['vary']
+    assert len(response.json()['todos']) == total
@@ -0,0 +1,126 @@
+import asyncio
+from collections import Counter
+
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from fast_zero.counters import (
+    apply_deltas,
+    read_counts,
+    removed,
+    repair,
+    state_changes,
+)
+from fast_zero.models import Todo, TodoCounter, TodoState, User
+from fast_zero.routers.todos import update_tudo
+from fast_zero.schemas import TodoUpdate
+from fast_zero.security import Principal
+
+
+def test_state_changes_moves_each_todo():
+    deltas = state_changes(
+        [TodoState.todo, TodoState.todo, TodoState.done], TodoState.done
+    )
+
+    assert +deltas == {TodoState.done: 2}
+    assert -deltas == {TodoState.todo: 2}
+
+
+def test_state_changes_without_new_state_is_empty():
+    assert not state_changes([TodoState.todo], None)
+
+
+def test_removed_decrements_each_state():
+    assert removed([TodoState.todo, TodoState.todo]) == {TodoState.todo: -2}
+
+
+@pytest.mark.asyncio
+async def test_apply_deltas_accumulates(session: AsyncSession, users):
+    user_id = users[0]['id']
+
+    await apply_deltas(session, user_id, Counter({TodoState.todo: 2}))
+    await apply_deltas(
+        session, user_id, Counter({TodoState.todo: -1, TodoState.done: 1})
+    )
+    await session.commit()
+
+    counts = await read_counts(session, user_id)
+
+    assert counts[TodoState.todo] == 1
+    assert counts[TodoState.done] == 1
+    assert counts[TodoState.draft] == 0
+
+
+@pytest.mark.asyncio
+async def test_repair_rebuilds_drifted_counters(session: AsyncSession, users):
+    user_id = users[0]['id']
+    session.add_all([
+        Todo('a', 'a', TodoState.doing, user_id),
+        Todo('b', 'b', TodoState.doing, user_id),
+        Todo('c', 'c', TodoState.trash, users[1]['id']),
+    ])
+    await apply_deltas(session, user_id, Counter({TodoState.done: 7}))
+    await session.commit()
+
+    # (user0, doing) e (user1, trash); o contador de done some
+    expected_rows = 2
+    expected_doing = 2
+
+    rows = await repair(session)
+    counts = await read_counts(session, user_id)
+
+    assert rows == expected_rows
+    assert counts[TodoState.doing] == expected_doing
+    assert counts[TodoState.done] == 0
+    assert (await read_counts(session, users[1]['id']))[TodoState.trash] == 1
+
+
+@pytest.mark.asyncio
+async def test_counters_are_deleted_with_user(session: AsyncSession, users):
+    await apply_deltas(session, users[0]['id'], Counter({TodoState.todo: 1}))
+    await session.commit()
+
+    await session.execute(delete(User).where(User.id == users[0]['id']))
+    await session.commit()
+
+    assert not (await session.scalars(select(TodoCounter))).all()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_keep_counters_exact(
+    session: AsyncSession, engine, users
+):
+    session.add(Todo('a', 'a', TodoState.todo, users[0]['id']))
+    await session.commit()
+    await repair(session)
+    principal = Principal(
+        id=users[0]['id'],
+        email=users[0]['email'],
+        username=users[0]['username'],
+    )
+    states = [TodoState.draft, TodoState.doing, TodoState.done] * 10
+    # Pool próprio: a fila do pool compartilhado ficaria presa a este loop
+    patch_engine = create_async_engine(engine.url)
+
+    async def patch(state):
+        async with AsyncSession(patch_engine) as other:
+            await update_tudo(1, other, principal, TodoUpdate(state=state))
+
+    try:
+        await asyncio.gather(*(patch(state) for state in states))
+    finally:
+        await patch_engine.dispose()
+
+    totals = dict.fromkeys(TodoState, 0)
+    totals.update(
+        (
+            await session.execute(
+                select(Todo.state, func.count()).group_by(Todo.state)
+            )
+        )
+        .tuples()
+        .all()
+    )
+
+    assert await read_counts(session, users[0]['id']) == totals
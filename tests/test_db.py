@@ -5,9 +5,13 @@ import pytest
 
 # from pytest import raises
 from sqlalchemy import select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from fast_zero.database import ReadRouter, create_engine, pool_stats
 from fast_zero.models import User
+from fast_zero.settings import Settings
 
 
 @pytest.mark.asyncio
@@ -21,7 +25,9 @@ async def test_create_user(session: AsyncSession, mock_db_time):
         await session.commit()
 
         user = await session.scalar(
-            select(User).where(User.username == 'alice')
+            select(User)
+            .where(User.username == 'alice')
+            .options(selectinload(User.todos))
         )
 
     assert asdict(user) == {
@@ -29,6 +35,7 @@ async def test_create_user(session: AsyncSession, mock_db_time):
         'username': 'alice',
         'email': 'alice@example.com',
         'password': 'secret',
+        'token_version': 0,
         'created_at': time,
         'updated_at': time,
         'todos': [],
@@ -54,7 +61,9 @@ async def test_update_user(session, mock_db_time):
         await session.commit()
 
         user = await session.scalar(
-            select(User).where(User.email == 'alice@example.com')
+            select(User)
+            .where(User.email == 'alice@example.com')
+            .options(selectinload(User.todos))
         )
 
     assert asdict(user) == {
@@ -62,7 +71,64 @@ async def test_update_user(session, mock_db_time):
         'username': 'alice',
         'email': 'alice@example.com',
         'password': 'secret',
+        'token_version': 0,
         'created_at': time,
         'updated_at': time1,
         'todos': [],
     }
+
+
+@pytest.mark.asyncio
+async def test_pool_records_wait_and_timeouts(engine):
+    url = engine.url.render_as_string(hide_password=False)
+    settings = Settings(
+        DATABASE_POOL_SIZE=1,
+        DATABASE_MAX_OVERFLOW=0,
+        DATABASE_POOL_TIMEOUT=0.1,
+    )
+    pool_engine = create_engine(url, settings)
+
+    async with pool_engine.connect():
+        busy = pool_stats(pool_engine)
+
+        with pytest.raises(PoolTimeoutError):
+            async with pool_engine.connect():
+                pass
+
+    stats = pool_stats(pool_engine)
+    await pool_engine.dispose()
+    # O checkout bem-sucedido e o que estourou o timeout
+    expected_checkouts = 2
+
+    assert busy['checked_out'] == 1
+    assert stats['checked_out'] == 0
+    assert stats['timeouts'] == 1
+    assert stats['wait_seconds']['count'] == expected_checkouts
+
+
+def test_read_router_round_robin_and_read_your_writes(settings):
+    replicas = [
+        create_engine(settings.DATABASE_URL, settings) for _ in range(2)
+    ]
+    router = ReadRouter(replicas, window=60, retry_after=60)
+
+    assert router.candidates(1) == replicas
+    assert router.candidates(1) == replicas[::-1]
+
+    router.mark_write(1)
+
+    assert router.candidates(1) == []
+    assert router.candidates(2)
+
+
+def test_read_router_skips_replicas_marked_down(settings):
+    replicas = [
+        create_engine(settings.DATABASE_URL, settings) for _ in range(2)
+    ]
+    router = ReadRouter(replicas, window=60, retry_after=60)
+
+    router.mark_down(replicas[0])
+
+    assert router.candidates(1) == [replicas[1]]
+    assert router.candidates(1) == [replicas[1]]
+    assert router.fallbacks == 1
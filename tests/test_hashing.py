@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from fast_zero.hashing import (
+    Argon2Params,
+    HashingExecutor,
+    HashingPoolBroken,
+    HashingPoolSaturated,
+    check_and_update_password,
+    check_password,
+    hash_password,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('kind', ['process', 'thread'])
+async def test_executor_hashes_and_verifies(kind):
+    executor = HashingExecutor(kind=kind, max_workers=1)
+
+    try:
+        hashed = await executor.run(hash_password, 'secret')
+
+        assert await executor.run(check_password, 'secret', hashed)
+        assert not await executor.run(check_password, 'other', hashed)
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_saturated():
+    executor = HashingExecutor(kind='thread', max_workers=1, max_pending=1)
+
+    try:
+        running = asyncio.create_task(executor.run(time.sleep, 0.2))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HashingPoolSaturated):
+            await executor.run(time.sleep, 0)
+
+        await running
+    finally:
+        executor.shutdown()
+
+    assert executor.rejected == 1
+
+
+def test_executor_unknown_kind():
+    with pytest.raises(ValueError, match='Unknown hashing executor'):
+        HashingExecutor(kind='gpu')
+
+
+def test_hash_password_uses_given_params():
+    params = Argon2Params(time_cost=1, memory_cost=8192, parallelism=1)
+
+    hashed = hash_password('secret', params)
+
+    assert hashed.startswith('$argon2id$v=19$m=8192,t=1,p=1$')
+    assert check_password('secret', hashed)
+
+
+def test_check_and_update_password_rehashes_on_param_change():
+    old = Argon2Params(time_cost=1, memory_cost=8192, parallelism=1)
+    new = Argon2Params(time_cost=2, memory_cost=8192, parallelism=1)
+    hashed = hash_password('secret', old)
+
+    assert check_and_update_password('secret', hashed, old) == (True, None)
+    assert check_and_update_password('other', hashed, new) == (False, None)
+
+    valid, updated = check_and_update_password('secret', hashed, new)
+
+    assert valid
+    assert updated.startswith('$argon2id$v=19$m=8192,t=2,p=1$')
+
+
+@pytest.mark.asyncio
+async def test_process_executor_recovers_from_dead_worker():
+    executor = HashingExecutor(kind='process', max_workers=1)
+    expected = 8
+
+    try:
+        # O worker sai sem responder, como num OOM kill
+        with pytest.raises(HashingPoolBroken):
+            await executor.run(os._exit, 1)
+
+        assert await executor.run(pow, 2, 3) == expected
+        assert executor.restarts == 1
+    finally:
+        executor.shutdown()
@@ -0,0 +1,31 @@
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.database import settings
+
+
+@pytest.fixture
+def internal_endpoints(monkeypatch):
+    monkeypatch.setattr(settings, 'INTERNAL_ENDPOINTS_ENABLED', True)
+
+
+def test_internal_endpoints_are_disabled_by_default(client):
+    response = client.get('/internal/pool')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_read_pool_stats(client, internal_endpoints):
+    response = client.get('/internal/pool')
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.json()) == {
+        'size',
+        'checked_out',
+        'checked_in',
+        'overflow',
+        'timeouts',
+        'wait_seconds',
+    }
+    assert '+Inf' in response.json()['wait_seconds']['buckets']
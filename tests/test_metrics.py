@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.app import request_metrics
+from fast_zero.metrics import Histogram, RequestMetrics
+from fast_zero.security import hashing_executor
+
+
+@pytest.fixture
+def metrics():
+    request_metrics.clear()
+    yield request_metrics
+    request_metrics.clear()
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    observations = (0.05, 0.1, 0.5, 3.0)
+
+    for value in observations:
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot['buckets'] == {'0.1': 2, '1.0': 3, '+Inf': 4}
+    assert snapshot['count'] == len(observations)
+    assert snapshot['sum'] == pytest.approx(sum(observations))
+
+
+def test_histogram_reset():
+    histogram = Histogram()
+    histogram.observe(1.0)
+
+    histogram.reset()
+
+    assert histogram.count == 0
+    assert histogram.sum == 0
+    assert all(total == 0 for _, total in histogram.cumulative())
+
+
+def test_request_metrics_render_prometheus_text():
+    metrics = RequestMetrics(buckets=(0.1,))
+
+    metrics.observe('GET', '/todos/', HTTPStatus.OK, 0.05)
+    metrics.observe('GET', '/todos/', HTTPStatus.NOT_MODIFIED, 0.2)
+
+    lines = metrics.render().splitlines()
+
+    assert (
+        'http_requests_total{method="GET",route="/todos/",status="200"} 1'
+    ) in lines
+    assert (
+        'http_request_duration_seconds_bucket'
+        '{method="GET",route="/todos/",le="0.1"} 1'
+    ) in lines
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/todos/"} 2'
+    ) in lines
+
+
+def test_metrics_middleware_uses_templated_route(
+    client, users, tokens, metrics
+):
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+    client.get('/users/1', headers=headers)
+    client.get('/users/2', headers=headers)
+    client.get('/does-not-exist')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'http_requests_total{method="GET",route="/users/{id}",status="200"} 2'
+    ) in response.text
+    assert 'route="/users/1"' not in response.text
+    assert (
+        'http_requests_total{method="GET",route="unmatched",status="404"} 1'
+    ) in response.text
+
+
+def test_metrics_expose_cache_and_hashing_stats(client, users, tokens):
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+    client.get('/users/1', headers=headers)
+    client.get('/users/1', headers=headers)
+
+    response = client.get('/metrics')
+
+    assert 'cache_hits_total{cache="principal"} 1' in response.text
+    assert 'cache_misses_total{cache="principal"} 1' in response.text
+    assert 'cache_size{cache="token_version"} 1' in response.text
+    assert (
+        f'hashing_rejected_total {hashing_executor.rejected}' in response.text
+    )
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.counters import read_counts, repair
+from fast_zero.models import Todo, TodoState
+from fast_zero.purge import TrashPurger
+
+
+async def seed(session: AsyncSession, users):
+    alice, bob = users[0]['id'], users[1]['id']
+    session.add_all([
+        Todo('a', 'a', TodoState.trash, alice),
+        Todo('b', 'b', TodoState.trash, alice),
+        Todo('c', 'c', TodoState.trash, bob),
+        Todo('d', 'd', TodoState.done, alice),
+        Todo('e', 'e', TodoState.trash, alice),
+    ])
+    await session.commit()
+
+    # Todos menos o último foram para a lixeira há 40 dias
+    await session.execute(
+        update(Todo)
+        .where(Todo.title != 'e')
+        .values(updated_at=func.now() - timedelta(days=40))
+    )
+    await session.commit()
+    await repair(session)
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_old_trash_in_batches(
+    session: AsyncSession, engine, users
+):
+    await seed(session, users)
+    purger = TrashPurger(
+        engine, retention=timedelta(days=30), batch_size=2, pause=0
+    )
+
+    deleted = await purger.run_once()
+    remaining = (await session.scalars(select(Todo.id))).all()
+    counts = await read_counts(session, users[0]['id'])
+    # Lote cheio (2), depois um parcial (1)
+    expected_deleted = 3
+    expected_batches = 2
+
+    assert deleted == expected_deleted
+    assert sorted(remaining) == [4, 5]
+    assert purger.stats.batches == expected_batches
+    assert counts[TodoState.trash] == 1
+    assert counts[TodoState.done] == 1
+    assert (await read_counts(session, users[1]['id']))[TodoState.trash] == 0
+    assert 'todos_purged_total 3' in purger.render()
+    assert 'todo_purge_runs_total 1' in purger.render()
+
+
+@pytest.mark.asyncio
+async def test_purge_skips_locked_rows(session: AsyncSession, engine, users):
+    await seed(session, users)
+    purger = TrashPurger(engine, retention=timedelta(days=30), pause=0)
+
+    async with engine.connect() as conn:
+        await conn.execute(
+            select(Todo.id).where(Todo.id == 1).with_for_update()
+        )
+
+        deleted = await purger.run_once()
+
+        await conn.rollback()
+
+    remaining = (await session.scalars(select(Todo.id))).all()
+    expected_deleted = 2
+
+    assert deleted == expected_deleted
+    assert sorted(remaining) == [1, 4, 5]
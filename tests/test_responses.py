@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import literal, select
+
+from fast_zero.models import TodoState
+from fast_zero.responses import (
+    TrustedJSONResponse,
+    page_serializer,
+    rows_as_dicts,
+)
+from fast_zero.schemas import TodoList, TodoPublic
+
+CONTENT = {
+    'todos': [
+        {
+            'title': 'título',
+            'description': 'descrição',
+            'state': TodoState.doing,
+            'id': 1,
+            'created_at': datetime(2024, 1, 1, 12, 30),
+            'updated_at': datetime(2024, 1, 2, 8, 0, 0, 123456),
+        }
+    ],
+    'next_cursor': None,
+}
+
+
+def test_trusted_json_matches_pydantic_serialization():
+    response = TrustedJSONResponse(CONTENT)
+
+    assert response.body == TodoList(**CONTENT).model_dump_json().encode()
+    assert response.headers['content-type'] == 'application/json'
+
+
+def test_page_serializer_matches_pydantic_serialization():
+    response = TrustedJSONResponse(
+        CONTENT, serializer=page_serializer('todos', TodoPublic)
+    )
+
+    assert response.body == TodoList(**CONTENT).model_dump_json().encode()
+
+
+@pytest.mark.asyncio
+async def test_rows_as_dicts(session):
+    rows = (
+        await session.execute(
+            select(literal(1).label('id'), literal('a').label('name'))
+        )
+    ).all()
+
+    assert rows_as_dicts(rows) == [{'id': 1, 'name': 'a'}]
+    assert rows_as_dicts([]) == []
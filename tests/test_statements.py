@@ -0,0 +1,49 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.database import create_engine
+from fast_zero.settings import Settings
+from fast_zero.statements import current_stats
+
+
+def test_server_timing_reports_statements(client, users, tokens):
+    response = client.get(
+        '/users/', headers={'Authorization': f'Bearer {tokens[0]}'}
+    )
+
+    # Principal e a página de usuários
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['server-timing'].startswith('db;dur=')
+    assert 'desc="2 statements"' in response.headers['server-timing']
+
+
+def test_list_users_statement_budget(client, users, tokens, max_statements):
+    with max_statements(2):
+        response = client.get(
+            '/users/', headers={'Authorization': f'Bearer {tokens[0]}'}
+        )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged(engine, caplog):
+    slow_engine = create_engine(
+        engine.url.render_as_string(hide_password=False),
+        Settings(SLOW_QUERY_THRESHOLD_MS=0),
+    )
+
+    with caplog.at_level(logging.WARNING, logger='fast_zero.statements'):
+        async with slow_engine.connect() as conn:
+            await conn.exec_driver_sql('SELECT 1')
+
+    await slow_engine.dispose()
+
+    assert 'Slow query' in caplog.text
+    assert 'SELECT 1' in caplog.text
+
+
+def test_current_stats_is_none_outside_requests():
+    assert current_stats() is None
@@ -0,0 +1,87 @@
+import pytest
+from freezegun import freeze_time
+from pydantic import ValidationError
+
+from fast_zero.settings import Settings
+from fast_zero.throttling import LoginThrottle, MemoryBackend, Rate, Throttled
+
+RATE = Rate(burst=2, per_second=0.5)
+
+
+@pytest.mark.asyncio
+async def test_bucket_refills_over_time():
+    backend = MemoryBackend(maxsize=10)
+
+    with freeze_time('2025-01-01 00:00:00') as frozen:
+        assert await backend.take('a', RATE) == 0
+        assert await backend.take('a', RATE) == 0
+        assert await backend.take('a', RATE) == pytest.approx(2)
+
+        frozen.tick(2)
+
+        assert await backend.take('a', RATE) == 0
+
+
+@pytest.mark.asyncio
+async def test_backend_is_bounded():
+    backend = MemoryBackend(maxsize=2)
+
+    for key in 'abc':
+        await backend.take(key, RATE)
+
+    assert len(backend) == backend.maxsize
+
+
+@pytest.mark.asyncio
+async def test_ip_is_checked_before_account():
+    throttle = LoginThrottle(
+        MemoryBackend(maxsize=10), account_rate=RATE, ip_rate=Rate(1, 0.1)
+    )
+
+    await throttle.check('Alice@example.com', '10.0.0.1')
+
+    with pytest.raises(Throttled) as exc:
+        await throttle.check('alice@example.com', '10.0.0.1')
+
+    assert exc.value.scope == 'ip'
+    assert throttle.rejected == {'ip': 1}
+
+    # Outro IP: a conta ainda tem uma ficha, a rejeição não a consumiu
+    await throttle.check('alice@example.com', '10.0.0.2')
+
+    with pytest.raises(Throttled) as exc:
+        await throttle.check('ALICE@example.com', '10.0.0.3')
+
+    assert exc.value.scope == 'account'
+    assert 'login_throttled_total{scope="account"} 1' in throttle.render()
+
+
+@pytest.mark.asyncio
+async def test_disabled_throttle_allows_everything():
+    throttle = LoginThrottle(
+        MemoryBackend(maxsize=10),
+        account_rate=Rate(0, 1),
+        ip_rate=Rate(0, 1),
+        enabled=False,
+    )
+
+    await throttle.check('alice@example.com', '10.0.0.1')
+
+
+def test_rate_rejects_non_positive_refill():
+    with pytest.raises(ValueError, match='per_second'):
+        Rate(burst=5, per_second=0)
+
+
+@pytest.mark.parametrize(
+    'field',
+    [
+        'LOGIN_ACCOUNT_BURST',
+        'LOGIN_ACCOUNT_PER_MINUTE',
+        'LOGIN_IP_BURST',
+        'LOGIN_IP_PER_MINUTE',
+    ],
+)
+def test_settings_reject_non_positive_login_rates(field):
+    with pytest.raises(ValidationError, match=field):
+        Settings(**{field: 0})
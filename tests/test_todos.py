@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from datetime import datetime
 from http import HTTPStatus
 
@@ -8,6 +11,8 @@ from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fast_zero.models import Todo, TodoState, User
+from fast_zero.routers.todos import settings
+from fast_zero.schemas import TodoPublic
 
 
 class TodoFactory(factory.Factory):
@@ -328,3 +333,519 @@ async def test_update_todo_not_found_error(client, users, tokens, session):
     assert response.status_code == HTTPStatus.NOT_FOUND
 
     assert response.json()['detail'] == 'Task not Found'
+
+
+@pytest.mark.asyncio
+async def test_list_todos_does_not_load_all_user_todos(
+    client: TestClient,
+    session: AsyncSession,
+    users,
+    tokens,
+    count_statements,
+):
+    session.add_all(TodoFactory.create_batch(50, user_id=users[0]['id']))
+    await session.commit()
+
+    # Principal, validador do ETag e a página de todos
+    expected_statements = 3
+
+    with count_statements() as statements:
+        response = client.get(
+            '/todos/?limit=1',
+            headers={'Authorization': f'Bearer {tokens[0]}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == expected_statements
+
+
+@pytest.mark.asyncio
+async def test_list_todos_with_cursor_pagination(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    total_todos = 5
+    page_size = 2
+
+    session.add_all(
+        TodoFactory.create_batch(total_todos, user_id=users[0]['id'])
+    )
+    await session.commit()
+
+    ids = []
+    cursor = None
+    pages = 0
+
+    while True:
+        url = f'/todos/?limit={page_size}'
+        if cursor:
+            url += f'&cursor={cursor}'
+
+        response = client.get(
+            url, headers={'Authorization': f'Bearer {tokens[0]}'}
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        data = response.json()
+        ids += [todo['id'] for todo in data['todos']]
+        pages += 1
+        cursor = data['next_cursor']
+
+        if not cursor:
+            break
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == total_todos
+    assert pages == total_todos // page_size + 1
+
+
+@pytest.mark.asyncio
+async def test_list_todos_offset_mode_returns_next_cursor(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=users[0]['id']))
+    await session.commit()
+
+    response = client.get(
+        '/todos/?offset=1&limit=1',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+    )
+    data = response.json()
+
+    assert [todo['id'] for todo in data['todos']] == [2]
+
+    response = client.get(
+        f'/todos/?cursor={data["next_cursor"]}',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+    )
+    data = response.json()
+
+    assert [todo['id'] for todo in data['todos']] == [3]
+    assert data['next_cursor'] is None
+
+
+def test_list_todos_with_invalid_cursor(client: TestClient, tokens):
+    response = client.get(
+        '/todos/?cursor=not-a-cursor',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'] == 'Invalid cursor'
+
+
+def test_list_todos_invalid_cursor_is_not_masked_by_etag(
+    client: TestClient, tokens
+):
+    # '*' casa com qualquer ETag: só o cursor decide a resposta
+    response = client.get(
+        '/todos/?cursor=not-a-cursor',
+        headers={
+            'Authorization': f'Bearer {tokens[0]}',
+            'If-None-Match': '*',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'] == 'Invalid cursor'
+
+
+@pytest.mark.asyncio
+async def test_list_todos_title_filter_escapes_wildcards(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add(TodoFactory(title='100% done', user_id=users[0]['id']))
+    session.add(TodoFactory(title='1000 done', user_id=users[0]['id']))
+    await session.commit()
+
+    response = client.get(
+        '/todos/?title=0%25 d',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+    )
+
+    data = response.json()['todos']
+
+    assert [todo['title'] for todo in data] == ['100% done']
+
+
+def test_create_todos_bulk(client: TestClient, tokens):
+    payload = [
+        {'title': f'todo {i}', 'description': 'bulk', 'state': 'draft'}
+        for i in range(3)
+    ]
+
+    response = client.post(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+        json=payload,
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+
+    data = response.json()['todos']
+
+    assert [todo['title'] for todo in data] == [p['title'] for p in payload]
+    assert [todo['id'] for todo in data] == [1, 2, 3]
+    assert all(todo['state'] == 'draft' for todo in data)
+
+
+def test_create_todos_bulk_inserts_one_statement_per_chunk(
+    client: TestClient, tokens, count_statements, monkeypatch
+):
+    monkeypatch.setattr(settings, 'TODOS_BULK_CHUNK_SIZE', 2)
+    payload = [{'title': 't', 'description': 'd'} for _ in range(5)]
+
+    with count_statements() as statements:
+        response = client.post(
+            '/todos/bulk',
+            headers={'Authorization': f'Bearer {tokens[0]}'},
+            json=payload,
+        )
+
+    # Os contadores entram num único upsert ao final
+    inserts = [s for s in statements if s.startswith('INSERT INTO todos ')]
+    expected_inserts = 3
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(response.json()['todos']) == len(payload)
+    assert len(inserts) == expected_inserts
+
+
+def test_create_todos_bulk_too_many_items(client: TestClient, tokens):
+    payload = [{'title': 't', 'description': 'd'}] * (
+        settings.TODOS_BULK_MAX_ITEMS + 1
+    )
+
+    response = client.post(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+        json=payload,
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_update_todos_bulk_by_ids(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add_all(
+        TodoFactory.create_batch(3, state='doing', user_id=users[0]['id'])
+    )
+    session.add(TodoFactory(state='doing', user_id=users[1]['id']))
+    await session.commit()
+
+    # O todo 4 é de outro usuário e não deve ser afetado
+    response = client.patch(
+        '/todos/bulk?ids=1&ids=2&ids=4',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+        json={'state': 'done'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'affected': 2, 'ids': [1, 2]}
+
+    response = client.get(
+        '/todos/?state=done', headers={'Authorization': f'Bearer {tokens[0]}'}
+    )
+
+    assert [todo['id'] for todo in response.json()['todos']] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_update_todos_bulk_by_filter(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add_all(
+        TodoFactory.create_batch(2, state='done', user_id=users[0]['id'])
+    )
+    session.add(TodoFactory(state='todo', user_id=users[0]['id']))
+    await session.commit()
+
+    response = client.patch(
+        '/todos/bulk?state=done',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+        json={'state': 'trash'},
+    )
+
+    assert response.json() == {'affected': 2, 'ids': [1, 2]}
+
+
+def test_update_todos_bulk_requires_selection_and_changes(
+    client: TestClient, tokens
+):
+    response = client.patch(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+        json={'state': 'trash'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert (
+        response.json()['detail']
+        == 'At least one selection criterion is required'
+    )
+
+    response = client.patch(
+        '/todos/bulk?ids=1',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+        json={},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'] == 'No fields to update'
+
+
+@pytest.mark.asyncio
+async def test_update_todos_bulk_rejects_null_fields(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add(TodoFactory(user_id=users[0]['id']))
+    await session.commit()
+
+    response = client.patch(
+        '/todos/bulk?ids=1',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+        json={'title': None, 'state': 'done'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['loc'] == ['body', 'title']
+
+
+@pytest.mark.asyncio
+async def test_delete_todos_bulk(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add_all(
+        TodoFactory.create_batch(2, state='trash', user_id=users[0]['id'])
+    )
+    session.add(TodoFactory(state='todo', user_id=users[0]['id']))
+    session.add(TodoFactory(state='trash', user_id=users[1]['id']))
+    await session.commit()
+
+    response = client.delete(
+        '/todos/bulk?state=trash',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'affected': 2, 'ids': [1, 2]}
+
+    response = client.get(
+        '/todos/', headers={'Authorization': f'Bearer {tokens[0]}'}
+    )
+
+    assert [todo['id'] for todo in response.json()['todos']] == [3]
+
+
+def test_create_todo_is_a_single_insert(
+    client: TestClient, tokens, count_statements
+):
+    # principal + INSERT ... RETURNING + upsert do contador
+    expected_statements = 3
+
+    with count_statements() as statements:
+        response = client.post(
+            '/todos/',
+            headers={'Authorization': f'Bearer {tokens[0]}'},
+            json={'title': 'Teste', 'description': 'testar'},
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(statements) == expected_statements
+    assert 'RETURNING' in statements[1]
+
+
+@pytest.mark.asyncio
+async def test_update_todo_does_not_refresh(
+    client: TestClient, session, users, tokens, count_statements
+):
+    todo = Todo('test', 'updating', 'doing', users[0]['id'])
+    session.add(todo)
+    await session.commit()
+
+    # principal + SELECT do todo + UPDATE ... RETURNING + contadores
+    expected_statements = 4
+
+    with count_statements() as statements:
+        response = client.patch(
+            '/todos/1',
+            json={'state': 'done'},
+            headers={'Authorization': f'Bearer {tokens[0]}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['updated_at']
+    assert len(statements) == expected_statements
+    assert 'RETURNING' in statements[2]
+
+
+@pytest.mark.asyncio
+async def test_delete_todo_is_committed(
+    client: TestClient, session, users, tokens
+):
+    session.add(Todo('test', 'test remove', 'trash', users[0]['id']))
+    await session.commit()
+
+    client.delete('/todos/1', headers={'Authorization': f'Bearer {tokens[0]}'})
+
+    response = client.delete(
+        '/todos/1', headers={'Authorization': f'Bearer {tokens[0]}'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_export_todos_ndjson(
+    client: TestClient, session: AsyncSession, users, tokens, monkeypatch
+):
+    monkeypatch.setattr(settings, 'TODOS_EXPORT_BATCH_SIZE', 2)
+    expected_todos = 5
+
+    session.add_all(
+        TodoFactory.create_batch(expected_todos, user_id=users[0]['id'])
+    )
+    session.add(TodoFactory(user_id=users[1]['id']))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export', headers={'Authorization': f'Bearer {tokens[0]}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [line['id'] for line in lines] == list(range(1, 6))
+    assert set(lines[0]) == set(TodoPublic.model_fields)
+
+
+@pytest.mark.asyncio
+async def test_export_todos_csv_with_filter(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add(TodoFactory(title='export me', user_id=users[0]['id']))
+    session.add(TodoFactory(title='normal', user_id=users[0]['id']))
+    await session.commit()
+
+    response = client.get(
+        '/todos/export?format=csv&title=export',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert len(rows) == 1
+    assert rows[0]['title'] == 'export me'
+    assert rows[0]['id'] == '1'
+
+
+@pytest.mark.asyncio
+async def test_list_todos_not_modified(
+    client: TestClient, session: AsyncSession, users, tokens, count_statements
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=users[0]['id']))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+
+    response = client.get('/todos/', headers=headers)
+    etag = response.headers['etag']
+
+    # Principal já em cache: apenas o agregado do validador
+    expected_statements = 1
+
+    with count_statements() as statements:
+        response = client.get(
+            '/todos/', headers={**headers, 'If-None-Match': etag}
+        )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['etag'] == etag
+    assert not response.content
+    assert len(statements) == expected_statements
+
+
+@pytest.mark.asyncio
+async def test_list_todos_etag_changes_on_write_and_query(
+    client: TestClient, session: AsyncSession, users, tokens
+):
+    session.add(TodoFactory(user_id=users[0]['id'], state=TodoState.draft))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+    etag = client.get('/todos/', headers=headers).headers['etag']
+
+    response = client.get(
+        '/todos/?limit=1', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+    client.patch('/todos/1', json={'state': 'done'}, headers=headers)
+
+    response = client.get(
+        '/todos/', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['etag'] != etag
+
+
+def test_todo_stats_follow_writes(client: TestClient, tokens):
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+    client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 't', 'description': 'd', 'state': 'draft'},
+    )
+    client.post(
+        '/todos/bulk',
+        headers=headers,
+        json=[
+            {'title': 't', 'description': 'd', 'state': 'todo'},
+            {'title': 't', 'description': 'd', 'state': 'todo'},
+        ],
+    )
+    client.patch('/todos/1', json={'state': 'done'}, headers=headers)
+    client.delete('/todos/2', headers=headers)
+
+    response = client.get('/todos/stats', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'counts': {
+            'draft': 0,
+            'todo': 1,
+            'doing': 0,
+            'done': 1,
+            'trash': 0,
+        },
+        'total': 2,
+    }
+
+
+def test_todo_stats_follow_bulk_writes(client: TestClient, tokens):
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+    client.post(
+        '/todos/bulk',
+        headers=headers,
+        json=[
+            {'title': 't', 'description': 'd', 'state': 'todo'},
+            {'title': 't', 'description': 'd', 'state': 'doing'},
+            {'title': 't', 'description': 'd', 'state': 'doing'},
+        ],
+    )
+    client.patch(
+        '/todos/bulk?ids=1&ids=2', json={'state': 'trash'}, headers=headers
+    )
+    client.delete('/todos/bulk?state=trash', headers=headers)
+
+    response = client.get('/todos/stats', headers=headers)
+
+    assert response.json()['counts']['doing'] == 1
+    assert response.json()['counts']['trash'] == 0
+    assert response.json()['total'] == 1
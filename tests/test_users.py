@@ -1,5 +1,18 @@
+import asyncio
+from collections import Counter
 from http import HTTPStatus
 
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from fast_zero.app import app
+from fast_zero.database import get_session
+from fast_zero.models import Todo, TodoState
+from fast_zero.routers import users as users_router
+from fast_zero.security import hashing_executor
+
 
 def test_create_user(client):
     # Exec
@@ -154,6 +167,29 @@ def test_delete_user(client, users, tokens):
     assert result['email'] == users[1]['email']
 
 
+@pytest.mark.asyncio
+async def test_delete_user_with_many_todos_does_not_load_them(
+    client, session: AsyncSession, users, tokens, max_statements
+):
+    total = 200
+    session.add_all([
+        Todo(f'todo {n}', 'd', TodoState.todo, users[1]['id'])
+        for n in range(total)
+    ])
+    await session.commit()
+
+    # principal + SELECT do usuário + DELETE; os todos saem no cascade
+    with max_statements(3):
+        response = client.delete(
+            '/users/2', headers={'Authorization': f'Bearer {tokens[1]}'}
+        )
+
+    remaining = await session.scalar(select(func.count(Todo.id)))
+
+    assert response.status_code == HTTPStatus.OK
+    assert remaining == 0
+
+
 def test_delete_user_forbidden(client, users, tokens):
     response = client.delete(
         '/users/1', headers={'Authorization': f'Bearer {tokens[1]}'}
@@ -161,3 +197,190 @@ def test_delete_user_forbidden(client, users, tokens):
 
     assert response.status_code == HTTPStatus.FORBIDDEN
     assert response.json()['detail'] == 'Not enough permissions'
+
+
+def test_list_users_with_cursor_pagination(client, users, tokens):
+    response = client.get(
+        '/users/?limit=1', headers={'Authorization': f'Bearer {tokens[0]}'}
+    )
+    data = response.json()
+
+    assert [user['id'] for user in data['users']] == [1]
+
+    response = client.get(
+        f'/users/?limit=1&cursor={data["next_cursor"]}',
+        headers={'Authorization': f'Bearer {tokens[0]}'},
+    )
+    data = response.json()
+
+    assert [user['id'] for user in data['users']] == [users[1]['id']]
+    assert data['next_cursor'] is None
+
+
+def test_list_users_with_invalid_cursor(client, users, tokens):
+    response = client.get(
+        '/users/?cursor=%%%', headers={'Authorization': f'Bearer {tokens[0]}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_create_user_checks_then_inserts(client, count_statements):
+    # SELECT EXISTS + INSERT ... ON CONFLICT DO NOTHING RETURNING
+    expected_statements = 2
+
+    with count_statements() as statements:
+        response = client.post(
+            '/users/',
+            json={
+                'username': 'alice',
+                'email': 'alice@example.com',
+                'password': 'secret',
+            },
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(statements) == expected_statements
+    assert 'ON CONFLICT DO NOTHING' in statements[-1]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_signups_do_not_reach_the_hashing_pool(
+    engine, session, users, monkeypatch
+):
+    signups = 20
+    # Hash real; com fila de 1 qualquer hash concorrente daria 503
+    monkeypatch.setattr(hashing_executor, 'max_pending', 1)
+    signup_engine = create_async_engine(engine.url)
+
+    async def get_session_override():
+        async with AsyncSession(signup_engine) as request_session:
+            yield request_session
+
+    app.dependency_overrides[get_session] = get_session_override
+    rejected = hashing_executor.rejected
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url='http://test'
+        ) as client:
+            responses = await asyncio.gather(*[
+                client.post(
+                    '/users/',
+                    json={
+                        'username': users[0]['username'],
+                        'email': users[0]['email'],
+                        'password': 'secret',
+                    },
+                )
+                for _ in range(signups)
+            ])
+    finally:
+        app.dependency_overrides.clear()
+        await signup_engine.dispose()
+
+    statuses = Counter(response.status_code for response in responses)
+
+    assert statuses == {HTTPStatus.CONFLICT: signups}
+    assert hashing_executor.rejected == rejected
+
+
+def test_update_user_does_not_refresh(client, users, tokens, count_statements):
+    # principal + SELECT de conflito + UPDATE ... RETURNING
+    expected_statements = 3
+
+    with count_statements() as statements:
+        response = client.put(
+            '/users/1',
+            json={
+                'username': 'teste',
+                'email': 'alice@example.com',
+                'password': 'secret',
+            },
+            headers={'Authorization': f'Bearer {tokens[0]}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == expected_statements
+    assert 'RETURNING' in statements[-1]
+
+
+@pytest.mark.asyncio
+async def test_create_user_concurrent_duplicates(engine, session, monkeypatch):
+    signups = 200
+
+    async def cheap_hash(password):
+        return password
+
+    # Cada requisição com a própria sessão, como em produção
+    async def get_session_override():
+        async with AsyncSession(
+            engine, expire_on_commit=False
+        ) as request_session:
+            yield request_session
+
+    monkeypatch.setattr(users_router, 'get_password_hash', cheap_hash)
+    app.dependency_overrides[get_session] = get_session_override
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url='http://test'
+        ) as client:
+            responses = await asyncio.gather(*[
+                client.post(
+                    '/users/',
+                    json={
+                        'username': 'alice',
+                        'email': 'alice@example.com',
+                        'password': 'secret',
+                    },
+                )
+                for _ in range(signups)
+            ])
+    finally:
+        app.dependency_overrides.clear()
+
+    statuses = Counter(response.status_code for response in responses)
+
+    assert statuses == {
+        HTTPStatus.CREATED: 1,
+        HTTPStatus.CONFLICT: signups - 1,
+    }
+
+
+def test_get_user_not_modified(client, users, tokens):
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+    etag = client.get('/users/1', headers=headers).headers['etag']
+
+    response = client.get(
+        '/users/1', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.content
+
+
+def test_get_user_etag_changes_after_update(client, users, tokens):
+    headers = {'Authorization': f'Bearer {tokens[0]}'}
+    etag = client.get('/users/1', headers=headers).headers['etag']
+
+    client.put(
+        '/users/1',
+        json={
+            'username': 'teste',
+            'email': 'alice@example.com',
+            'password': 'secret',
+        },
+        headers=headers,
+    )
+    # A atualização revoga o token de alice: lê com o de bob
+    response = client.get(
+        '/users/1',
+        headers={
+            'Authorization': f'Bearer {tokens[1]}',
+            'If-None-Match': etag,
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['username'] == 'teste'